@@ -1,20 +1,99 @@
+import asyncio
+import copy
 import datetime
+import functools
 import json
+import threading
 import urllib.parse
 
+from concurrent.futures import ThreadPoolExecutor
+
+from .columnar import AudioFeatureMatrix, require_numpy
 from .consts import SEARCH_TYPES, ENTITY_TYPES, TIME_RANGES
-from .decorators import id_validation, ids_validation, token_refresh, auth_validation, recommendations_validation
-from .errors import ValidationError
+from .decorators import id_validation, ids_validation, auth_validation, recommendations_validation
+from .errors import HTTPError, ValidationError
+from .loader import AsyncBatchLoader, BatchLoader
 from .models import Album, SimplifiedAlbum, Artist, SimplifiedTrack, Track, \
     AudioFeature, AudioAnalysis, SearchResult, Paging, CustomPaging, CursorBasedPaging, \
     PrivateUser, PublicUser, Category, RecommendationsResponse, SimplifiedPlaylist, \
-    SavedAlbum, SavedTrack
-from .util import http_request, validate_limit, validate_offset
+    SavedAlbum, SavedTrack, AsyncPaging, AsyncCustomPaging, AsyncCursorBasedPaging
+from .util import async_http_request, chunked, http_request, validate_limit, validate_offset
+
+
+def endpoint_method(func):
+    """
+    Mark a method of SpotifyBase which returns the result of __request__ or of another endpoint.
+    coroutine_endpoints makes coroutine functions of the marked methods.
+    """
+    func.__endpoint__ = True
+    return func
+
+
+def coroutine_endpoints(cls):
+    """
+    Class decorator which replaces every endpoint of SpotifyBase by a coroutine function awaiting it.
+    Validation errors are raised when the coroutine is awaited, like HTTP errors.
+    """
+    def make_coroutine_function(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            return await func(self, *args, **kwargs)
+        return wrapper
+
+    for name, func in vars(SpotifyBase).items():
+        if getattr(func, '__endpoint__', False) and name not in vars(cls):
+            setattr(cls, name, make_coroutine_function(func))
+    return cls
+
+
+def convert_items(key, converter):
+    """
+    :return: Converter of a response whose key is a list of objects, some of which may be null
+    """
+    def convert(response):
+        return [converter(item) if item is not None else None for item in response[key]]
+    return convert
 
 
 class SpotifyBase:
-    def __init__(self, authorization):
+    """
+    Endpoints of the Web API. Each endpoint builds its URL and passes it to __request__ with a converter
+    of the response, so Spotify and AsyncSpotify differ only in __request__ and in how several requests
+    are combined.
+    """
+
+    paging_class = Paging
+    custom_paging_class = CustomPaging
+    cursor_based_paging_class = CursorBasedPaging
+
+    def __init__(self, authorization, batch_window=None, timeout=None):
+        """
+        :param authorization: ClientCredentialsFlow or AuthorizationCodeFlow object
+        :param batch_window: Optional. Seconds to collect get_album, get_artist and get_track calls
+               into one get_albums, get_artists or get_tracks request. AsyncSpotify accepts 0, one event loop
+               iteration. Default None, every call is sent on its own.
+        :param timeout: Optional. Timeout object or seconds, applied to every request and to the paging
+               objects returned. Default DEFAULT_TIMEOUT.
+        """
         self.authorization = authorization
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self._loaders = {}
+        self._loaders_lock = threading.Lock()
+
+    def with_timeout(self, timeout):
+        """
+        Copy of this object which sends its requests with another timeout, e.g.
+        spotify.with_timeout(Timeout(read=5, total=10)).get_album(album_id)
+        :param timeout: Timeout object or seconds
+        :return: Spotify or AsyncSpotify object sharing the authorization
+        """
+        clone = copy.copy(self)
+        clone.timeout = timeout
+        # batch loaders are bound to the methods of the object which created them
+        clone._loaders = {}
+        clone._loaders_lock = threading.Lock()
+        return clone
 
     @classmethod
     def make_full_url(cls, endpoint, data):
@@ -24,13 +103,37 @@ class SpotifyBase:
         )
         return full_url
 
+    def __request__(self, url, converter=None, data=None, method='GET'):
+        """
+        Send a request to the Web API. The transport refreshes the access token when it expires soon.
+        :param url: Full URL
+        :param converter: Optional. Callable which takes the decoded response. Default None, the response is returned.
+        :param data: Optional. Request body
+        :param method: Optional. HTTP method. Default GET.
+        :return: Converted response. A coroutine for AsyncSpotify.
+        """
+        raise NotImplementedError
 
-class Spotify(SpotifyBase):
+    def _album(self, raw_json):
+        return Album(raw_json, self.authorization, paging_class=self.paging_class, timeout=self.timeout)
+
+    def _paging(self, klass):
+        return lambda response: self.paging_class(response, klass, self.authorization, timeout=self.timeout)
+
+    def _custom_paging(self, klass, key):
+        return lambda response: self.custom_paging_class(
+            response, klass, self.authorization, key, timeout=self.timeout
+        )
+
+    def _cursor_based_paging(self, klass, key):
+        return lambda response: self.cursor_based_paging_class(
+            response, klass, self.authorization, key, timeout=self.timeout
+        )
 
     # Albums
 
     @id_validation('album id')
-    @token_refresh
+    @endpoint_method
     def get_album(self, album_id, market=None):
         """
         Get album information
@@ -39,6 +142,8 @@ class Spotify(SpotifyBase):
         :param market: Optional. ISO 3166-1 alpha-2 country code
         :return: Album object
         """
+        if self.batch_window is not None:
+            return self._batch_load(self.get_albums, album_id, market=market)
         endpoint = 'https://api.spotify.com/v1/albums/{id}'.format(
             id=album_id
         )
@@ -48,12 +153,10 @@ class Spotify(SpotifyBase):
             }
             data = urllib.parse.urlencode(query)
             endpoint = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, endpoint)
-        result = Album(response, self.authorization)
-        return result
+        return self.__request__(endpoint, self._album)
 
     @id_validation('album id')
-    @token_refresh
+    @endpoint_method
     def get_albums_tracks(self, album_id, limit=20, offset=0, market=None):
         """
         Get tracks which is contained album
@@ -81,11 +184,10 @@ class Spotify(SpotifyBase):
 
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return Paging(response, SimplifiedTrack, self.authorization)
+        return self.__request__(full_url, self._paging(SimplifiedTrack))
 
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def get_albums(self, album_ids, market=None):
         """
         Get several albums information.
@@ -103,17 +205,24 @@ class Spotify(SpotifyBase):
             queries['market'] = market
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        converter = Album.to_object
-        results = []
-        for result in response['albums']:
-            results.append(converter(result))
-        return results
+        return self.__request__(full_url, convert_items('albums', self._album))
+
+    @ids_validation(None)
+    @endpoint_method
+    def get_albums_bulk(self, album_ids, market=None, parallelism=4):
+        """
+        Get any number of albums. IDs are split into requests of 50 IDs which are sent concurrently.
+        :param album_ids: List of the Spotify IDs.
+        :param market: Optional. ISO 3166-1 alpha-2 country code
+        :param parallelism: Optional. Maximum number of requests in flight. Default 4.
+        :return: List of Album objects in the order of album_ids. None for unknown IDs.
+        """
+        return self._fetch_in_chunks(self.get_albums, album_ids, 50, parallelism, market=market)
 
     # Artist
 
     @id_validation('artist id')
-    @token_refresh
+    @endpoint_method
     def get_artist(self, artist_id):
         """
         Get artist information.
@@ -121,15 +230,15 @@ class Spotify(SpotifyBase):
         :param artist_id: The Spotify ID for artist
         :return: Artist object
         """
+        if self.batch_window is not None:
+            return self._batch_load(self.get_artists, artist_id)
         endpoint = 'https://api.spotify.com/v1/artists/{id}'.format(
             id=artist_id
         )
-        response = http_request(self.authorization, endpoint)
-        result = Artist(response)
-        return result
+        return self.__request__(endpoint, Artist)
 
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def get_artists(self, artist_ids):
         """
         Get several artists information.
@@ -145,15 +254,21 @@ class Spotify(SpotifyBase):
 
         data = urllib.parse.urlencode(query)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        converter = Artist.to_object
-        results = []
-        for result in response['artists']:
-            results.append(converter(result))
-        return results
+        return self.__request__(full_url, convert_items('artists', Artist.to_object))
+
+    @ids_validation(None)
+    @endpoint_method
+    def get_artists_bulk(self, artist_ids, parallelism=4):
+        """
+        Get any number of artists. IDs are split into requests of 50 IDs which are sent concurrently.
+        :param artist_ids: List of the Spotify IDs.
+        :param parallelism: Optional. Maximum number of requests in flight. Default 4.
+        :return: List of Artist objects in the order of artist_ids. None for unknown IDs.
+        """
+        return self._fetch_in_chunks(self.get_artists, artist_ids, 50, parallelism)
 
     @id_validation('artist id')
-    @token_refresh
+    @endpoint_method
     def get_artist_albums(self, artist_id, include_groups=None, limit=20, offset=0, country=None):
         """
         Get information about artist's albums
@@ -190,11 +305,10 @@ class Spotify(SpotifyBase):
 
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return Paging(response, SimplifiedAlbum, self.authorization)
+        return self.__request__(full_url, self._paging(SimplifiedAlbum))
 
     @id_validation('artist id')
-    @token_refresh
+    @endpoint_method
     def get_related_artists(self, artist_id):
         """
         Get information about 20 related artists to a given artist.
@@ -205,15 +319,10 @@ class Spotify(SpotifyBase):
         endpoint = 'https://api.spotify.com/v1/artists/{artist_id}/related-artists'.format(
             artist_id=artist_id
         )
-        response = http_request(self.authorization, endpoint)
-        converter = Artist.to_object
-        results = []
-        for result in response['artists']:
-            results.append(converter(result))
-        return results
+        return self.__request__(endpoint, convert_items('artists', Artist.to_object))
 
     @id_validation('artist id')
-    @token_refresh
+    @endpoint_method
     def get_artist_top_tracks(self, artist_id, county_code=None):
         """
         Get information about an artist's top tracks.
@@ -236,17 +345,12 @@ class Spotify(SpotifyBase):
         }
         data = urllib.parse.urlencode(query)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        converter = Track.to_object
-        results = []
-        for result in response['tracks']:
-            results.append(converter(result))
-        return results
+        return self.__request__(full_url, convert_items('tracks', Track.to_object))
 
     # Browse
 
     @id_validation('category id')
-    @token_refresh
+    @endpoint_method
     def get_category(self, category_id):
         """
         Endpoint: GET https://api.spotify.com/v1/browse/categories/{category_id}
@@ -256,11 +360,9 @@ class Spotify(SpotifyBase):
         endpoint = 'https://api.spotify.com/v1/browse/categories/{category_id}'.format(
             category_id=category_id
         )
-        response = http_request(self.authorization, endpoint)
-        result = Category(response)
-        return result
+        return self.__request__(endpoint, Category)
 
-    @token_refresh
+    @endpoint_method
     def get_categories(self, country=None, locale=None, limit=20, offset=0):
         """
         Endpoint: GET https://api.spotify.com/v1/browse/categories
@@ -286,10 +388,10 @@ class Spotify(SpotifyBase):
             queries['locale'] = locale
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return CustomPaging(response, Category, self.authorization, 'categories')
+        return self.__request__(full_url, self._custom_paging(Category, 'categories'))
 
     @recommendations_validation
+    @endpoint_method
     def get_recommendations(self, limit=20, market=None, seed_artists=None, seed_genres=None, seed_tracks=None, **kwargs):
         """
         Recommend tracks. Recommendation are generated based on the given seed entities.
@@ -331,10 +433,9 @@ class Spotify(SpotifyBase):
         queries.update(**kwargs)
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return RecommendationsResponse(response)
+        return self.__request__(full_url, RecommendationsResponse)
 
-    @token_refresh
+    @endpoint_method
     def get_available_genre_seeds(self):
         """
         Get available genre seeds. Genre seeds use for recommendations.
@@ -342,10 +443,9 @@ class Spotify(SpotifyBase):
         :return: List of available genre seeds
         """
         endpoint = 'https://api.spotify.com/v1/recommendations/available-genre-seeds'
-        response = http_request(self.authorization, endpoint)
-        return response['genres']
+        return self.__request__(endpoint, lambda response: response['genres'])
 
-    @token_refresh
+    @endpoint_method
     def get_new_release(self, country=None, limit=20, offset=0):
         """
 
@@ -368,11 +468,10 @@ class Spotify(SpotifyBase):
             queries['country'] = country
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return CustomPaging(response, SimplifiedAlbum, self.authorization, 'albums')
+        return self.__request__(full_url, self._custom_paging(SimplifiedAlbum, 'albums'))
 
     @id_validation('category id')
-    @token_refresh
+    @endpoint_method
     def get_category_playlists(self, category_id, limit=20, offset=0, country=None):
         """
         Endpoint: GET https://api.spotify.com/v1/browse/categories/{category_id}/playlists
@@ -398,10 +497,9 @@ class Spotify(SpotifyBase):
             queries['country'] = country
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return CustomPaging(response, SimplifiedPlaylist, self.authorization, 'playlists')
+        return self.__request__(full_url, self._custom_paging(SimplifiedPlaylist, 'playlists'))
 
-    @token_refresh
+    @endpoint_method
     def get_featured_playlists(self, locale=None, country=None, timestamp=None, limit=20, offset=0):
         """
         Get featured playlists.
@@ -436,14 +534,13 @@ class Spotify(SpotifyBase):
             queries['timestamp'] = timestamp
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return CustomPaging(response, SimplifiedPlaylist, self.authorization, 'playlists')
+        return self.__request__(full_url, self._custom_paging(SimplifiedPlaylist, 'playlists'))
 
     # Follow
 
     @auth_validation(['user-follow-read'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def check_current_user_follow_artists(self, ids=None):
         """
         check current user is following artists or users.
@@ -458,12 +555,11 @@ class Spotify(SpotifyBase):
         }
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return response
+        return self.__request__(full_url)
 
     @auth_validation(['user-follow-read'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def check_current_user_follow_users(self, ids=None):
         """
         check current user is following artists or users.
@@ -478,12 +574,11 @@ class Spotify(SpotifyBase):
         }
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return response
+        return self.__request__(full_url)
 
     @auth_validation(['playlisy-read-private'])
     @id_validation('playlist_id')
-    @token_refresh
+    @endpoint_method
     def check_users_follow_playlist(self, playlist_id, ids=None):
         """
         check one or more users following playlist
@@ -507,11 +602,10 @@ class Spotify(SpotifyBase):
         }
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return response
+        return self.__request__(full_url)
 
     @auth_validation(['user-follow-read'])
-    @token_refresh
+    @endpoint_method
     def get_current_user_follow_artists(self, limit=20, after=None):
         """
         Get the current user's followed artists.
@@ -532,12 +626,11 @@ class Spotify(SpotifyBase):
             queries['after'] = after
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return CursorBasedPaging(response, Artist, self.authorization, 'artists')
+        return self.__request__(full_url, self._cursor_based_paging(Artist, 'artists'))
 
     @auth_validation(['user-follow-modify'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def follow_artists(self, artist_ids):
         """
         Follow artists
@@ -551,12 +644,11 @@ class Spotify(SpotifyBase):
             'type': 'artist'
         }
         full_url = self.make_full_url(endpoint, urllib.parse.urlencode(query_param))
-        response = http_request(self.authorization, full_url, method='PUT')
-        return response
+        return self.__request__(full_url, method='PUT')
 
     @auth_validation(['user-follow-modify'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def follow_users(self, user_ids):
         """
         Follow users
@@ -570,12 +662,11 @@ class Spotify(SpotifyBase):
             'type': 'user'
         }
         full_url = self.make_full_url(endpoint, urllib.parse.urlencode(query_param))
-        response = http_request(self.authorization, full_url, method='PUT')
-        return response
+        return self.__request__(full_url, method='PUT')
 
     @auth_validation(['play-list-modify-public', 'playlist-modify-private'])
     @id_validation('playlist ID')
-    @token_refresh
+    @endpoint_method
     def follow_playlist(self, playlist_id, is_public=True):
         """
         Follow playlist
@@ -589,12 +680,11 @@ class Spotify(SpotifyBase):
             playlist_id=playlist_id
         )
         data = json.dumps(is_public).encode('utf-8')
-        response = http_request(self.authorization, endpoint, data=data, method='PUT')
-        return response
+        return self.__request__(endpoint, data=data, method='PUT')
 
     @auth_validation(['user-follow-modify'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def unfollow_artists(self, artist_ids):
         """
         Unfollow artists
@@ -608,12 +698,11 @@ class Spotify(SpotifyBase):
             'type': 'artist'
         }
         full_url = self.make_full_url(endpoint, urllib.parse.urlencode(query_param))
-        response = http_request(self.authorization, full_url, method='DELETE')
-        return response
+        return self.__request__(full_url, method='DELETE')
 
     @auth_validation(['user-follow-modify'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def unfollow_users(self, user_ids):
         """
         Unfollow users
@@ -627,12 +716,11 @@ class Spotify(SpotifyBase):
             'type': 'user'
         }
         full_url = self.make_full_url(endpoint, urllib.parse.urlencode(query_param))
-        response = http_request(self.authorization, full_url, method='DELETE')
-        return response
+        return self.__request__(full_url, method='DELETE')
 
     @auth_validation(['play-list-modify-public', 'playlist-modify-private'])
     @id_validation('playlist ID')
-    @token_refresh
+    @endpoint_method
     def unfollow_playlist(self, playlist_id, is_public=True):
         """
         Unfollow playlist
@@ -646,14 +734,13 @@ class Spotify(SpotifyBase):
             playlist_id=playlist_id
         )
         data = json.dumps(is_public).encode('utf-8')
-        response = http_request(self.authorization, endpoint, data=data, method='DELETE')
-        return response
+        return self.__request__(endpoint, data=data, method='DELETE')
 
     # Library
 
     @auth_validation(['user-library-read'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def check_users_saved_albums(self, album_ids):
         """
         Chck albums already saved in the current 'Your Music' library
@@ -667,12 +754,11 @@ class Spotify(SpotifyBase):
         }
         data = urllib.parse.urlencode(query)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return response
+        return self.__request__(full_url)
 
     @auth_validation(['user-library-read'])
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def check_users_saved_tracks(self, track_ids, market=None):
         """
         Check albums already saved in the current 'Your Music' library
@@ -689,11 +775,10 @@ class Spotify(SpotifyBase):
             queries['market'] = market
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return response
+        return self.__request__(full_url)
 
     @auth_validation(['user-library-read'])
-    @token_refresh
+    @endpoint_method
     def get_current_users_saved_album(self, limit=20, offset=0, market=None):
         """
         Get a list of the albums saved in the current user.
@@ -717,11 +802,10 @@ class Spotify(SpotifyBase):
             queries['market'] = market
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return Paging(response, SavedAlbum, self.authorization)
+        return self.__request__(full_url, self._paging(SavedAlbum))
 
     @auth_validation(['user-library-read'])
-    @token_refresh
+    @endpoint_method
     def get_current_users_saved_track(self, limit=20, offset=0, market=None):
         """
         Get a list of the tracks saved in the current user.
@@ -745,12 +829,11 @@ class Spotify(SpotifyBase):
             queries['market'] = market
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        return Paging(response, SavedTrack, self.authorization)
+        return self.__request__(full_url, self._paging(SavedTrack))
 
     @ids_validation(50)
     @auth_validation(['user-library-modify'])
-    @token_refresh
+    @endpoint_method
     def remove_current_user_saved_albums(self, album_ids):
         """
         Remove saved albums for current user.
@@ -760,12 +843,11 @@ class Spotify(SpotifyBase):
         """
         endpoint = 'https://api.spotify.com/v1/me/albums'
         data = json.dumps(album_ids).encode('utf-8')
-        response = http_request(self.authorization, endpoint, data=data, method='DELETE')
-        return response
+        return self.__request__(endpoint, data=data, method='DELETE')
 
     @ids_validation(50)
     @auth_validation(['user-library-modify'])
-    @token_refresh
+    @endpoint_method
     def remove_current_user_saved_tracks(self, track_ids):
         """
         Remove saved tracks for current user.
@@ -775,12 +857,11 @@ class Spotify(SpotifyBase):
         """
         endpoint = 'https://api.spotify.com/v1/me/tracks'
         data = json.dumps(track_ids).encode('utf-8')
-        response = http_request(self.authorization, endpoint, data=data, method='DELETE')
-        return response
+        return self.__request__(endpoint, data=data, method='DELETE')
 
     @ids_validation(50)
     @auth_validation(['user-library-modify'])
-    @token_refresh
+    @endpoint_method
     def save_albums_for_current_user(self, album_ids):
         """
         Add albums for current user's library.
@@ -790,12 +871,11 @@ class Spotify(SpotifyBase):
         """
         endpoint = 'https://api.spotify.com/v1/me/albums'
         data = json.dumps(album_ids).encode('utf-8')
-        response = http_request(self.authorization, endpoint, data=data, method='PUT')
-        return response
+        return self.__request__(endpoint, data=data, method='PUT')
 
     @ids_validation(50)
     @auth_validation(['user-library-modify'])
-    @token_refresh
+    @endpoint_method
     def save_tracks_for_current_user(self, track_ids):
         """
         Add tracks for current user's library.
@@ -805,14 +885,13 @@ class Spotify(SpotifyBase):
         """
         endpoint = 'https://api.spotify.com/v1/me/tracks'
         data = json.dumps(track_ids).encode('utf-8')
-        response = http_request(self.authorization, endpoint, data=data, method='PUT')
-        return response
+        return self.__request__(endpoint, data=data, method='PUT')
 
     # Personalization
 
     @id_validation('type')
     @auth_validation(['user-top-read'])
-    @token_refresh
+    @endpoint_method
     def get_users_top(self, entity_type, limit=20, offset=0, time_range='medium_term'):
         """
 
@@ -847,16 +926,15 @@ class Spotify(SpotifyBase):
         }
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
         if entity_type.lower() == 'artists':
             klass = Artist
         elif entity_type.lower() == 'tracks':
             klass = Track
-        return Paging(response, klass, self.authorization)
+        return self.__request__(full_url, self._paging(klass))
 
     # Search
 
-    @token_refresh
+    @endpoint_method
     def search(self, q='', search_types=SEARCH_TYPES, market=None, limit=20, offset=0):
         """
         Get information about artists, albums, tracks, playlist with match a keyword string.
@@ -905,14 +983,18 @@ class Spotify(SpotifyBase):
 
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        results = SearchResult(q, search_types, response, self.authorization)
-        return results
+        return self.__request__(
+            full_url,
+            lambda response: SearchResult(
+                q, search_types, response, self.authorization, paging_class=self.custom_paging_class,
+                timeout=self.timeout
+            )
+        )
 
     # Track
 
     @id_validation('track id')
-    @token_refresh
+    @endpoint_method
     def get_track(self, track_id, market=None):
         """
         Get track information.
@@ -921,6 +1003,8 @@ class Spotify(SpotifyBase):
         :param market: Optional. ISO 3166-1 alpha-2 country code
         :return: Track object
         """
+        if self.batch_window is not None:
+            return self._batch_load(self.get_tracks, track_id, market=market)
         endpoint = 'https://api.spotify.com/v1/tracks/{track_id}'.format(
             track_id=track_id
         )
@@ -930,12 +1014,10 @@ class Spotify(SpotifyBase):
             }
             data = urllib.parse.urlencode(query)
             endpoint = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, endpoint)
-        result = Track(response)
-        return result
+        return self.__request__(endpoint, Track)
 
     @ids_validation(50)
-    @token_refresh
+    @endpoint_method
     def get_tracks(self, track_ids, market=None):
         """
         Get several track informations.
@@ -952,15 +1034,22 @@ class Spotify(SpotifyBase):
             queries['market'] = market
         data = urllib.parse.urlencode(queries)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        converter = Track.to_object
-        results = []
-        for result in response['tracks']:
-            results.append(converter(result))
-        return results
+        return self.__request__(full_url, convert_items('tracks', Track.to_object))
+
+    @ids_validation(None)
+    @endpoint_method
+    def get_tracks_bulk(self, track_ids, market=None, parallelism=4):
+        """
+        Get any number of tracks. IDs are split into requests of 50 IDs which are sent concurrently.
+        :param track_ids: List of the Spotify IDs.
+        :param market: Optional. ISO 3166-1 alpha-2 country code
+        :param parallelism: Optional. Maximum number of requests in flight. Default 4.
+        :return: List of Track objects in the order of track_ids. None for unknown IDs.
+        """
+        return self._fetch_in_chunks(self.get_tracks, track_ids, 50, parallelism, market=market)
 
     @id_validation('track id')
-    @token_refresh
+    @endpoint_method
     def get_audio_analysis(self, track_id):
         """
         Get audio feature for track.
@@ -971,12 +1060,10 @@ class Spotify(SpotifyBase):
         endpoint = 'https://api.spotify.com/v1/audio-analysis/{id}'.format(
             id=track_id
         )
-        response = http_request(self.authorization, endpoint)
-        result = AudioAnalysis(response)
-        return result
+        return self.__request__(endpoint, AudioAnalysis)
 
     @id_validation('track id')
-    @token_refresh
+    @endpoint_method
     def get_audio_feature(self, track_id):
         """
         Get audio feature for track.
@@ -986,12 +1073,10 @@ class Spotify(SpotifyBase):
         endpoint = 'https://api.spotify.com/v1/audio-features/{id}'.format(
             id=track_id
         )
-        response = http_request(self.authorization, endpoint)
-        result = AudioFeature(response)
-        return result
+        return self.__request__(endpoint, AudioFeature)
 
     @ids_validation(100)
-    @token_refresh
+    @endpoint_method
     def get_audio_features(self, track_ids):
         """
         Get several audio features
@@ -1004,28 +1089,49 @@ class Spotify(SpotifyBase):
         }
         data = urllib.parse.urlencode(query)
         full_url = self.make_full_url(endpoint, data)
-        response = http_request(self.authorization, full_url)
-        converter = AudioFeature.to_object
-        results = []
-        for result in response['audio_features']:
-            results.append(converter(result))
-        return results
+        return self.__request__(full_url, convert_items('audio_features', AudioFeature.to_object))
+
+    @ids_validation(None)
+    @endpoint_method
+    def get_audio_features_bulk(self, track_ids, parallelism=4):
+        """
+        Get any number of audio features. IDs are split into requests of 100 IDs which are sent concurrently.
+        :param track_ids: List of the Spotify IDs.
+        :param parallelism: Optional. Maximum number of requests in flight. Default 4.
+        :return: List of AudioFeature objects in the order of track_ids. None for unknown IDs.
+        """
+        return self._fetch_in_chunks(self.get_audio_features, track_ids, 100, parallelism)
+
+    @ids_validation(None)
+    @endpoint_method
+    def get_audio_features_matrix(self, track_ids, parallelism=4):
+        """
+        Get any number of audio features as one array. See get_audio_features_bulk.
+        :param track_ids: List of the Spotify IDs.
+        :param parallelism: Optional. Maximum number of requests in flight. Default 4.
+        :return: AudioFeatureMatrix object with a row per ID in the order of track_ids. Requires numpy.
+        """
+        # fail before sending any request
+        require_numpy()
+        return self._fetch_in_chunks(
+            self.get_audio_features, track_ids, 100, parallelism,
+            converter=lambda features: AudioFeatureMatrix.from_features(features, track_ids)
+        )
 
     # Users Profile
 
     @auth_validation(['user-read-email', 'user-read-private', 'user-read-birthdate'])
-    @token_refresh
+    @endpoint_method
     def get_current_user_profile(self):
         """
         Endpoint: GET https://api.spotify.com/v1/me
         :return: PrivateUser object
         """
         endpoint = 'https://api.spotify.com/v1/me'
-        response = http_request(self.authorization, endpoint)
-        return PrivateUser(response)
+        return self.__request__(endpoint, PrivateUser)
 
     @id_validation('user id')
-    @token_refresh
+    @endpoint_method
     def get_user_profile(self, user_id):
         """
         Endpoint: GET https://api.spotify.com/v1/users/{user_id}
@@ -1035,5 +1141,73 @@ class Spotify(SpotifyBase):
         endpoint = 'https://api.spotify.com/v1/users/{user_id}'.format(
             user_id=user_id
         )
-        response = http_request(self.authorization, endpoint)
-        return PublicUser(response)
+        return self.__request__(endpoint, PublicUser)
+
+
+class Spotify(SpotifyBase):
+
+    def __request__(self, url, converter=None, data=None, method='GET'):
+        response = http_request(self.authorization, url, data=data, method=method, timeout=self.timeout)
+        return converter(response) if converter is not None else response
+
+    def _batch_load(self, method, entity_id, **kwargs):
+        loader_key = (method.__func__,) + tuple(sorted(kwargs.items()))
+        with self._loaders_lock:
+            loader = self._loaders.get(loader_key)
+            if loader is None:
+                loader = self._loaders[loader_key] = BatchLoader(
+                    lambda ids: method(ids, **kwargs), window=self.batch_window
+                )
+        result = loader.load(entity_id)
+        if result is None:
+            raise HTTPError('Not Found', 404)
+        return result
+
+    def _fetch_in_chunks(self, method, ids, chunk_size, parallelism, converter=None, **kwargs):
+        chunks = list(chunked(ids, chunk_size))
+        if parallelism > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(parallelism, len(chunks))) as executor:
+                results = list(executor.map(lambda chunk: method(chunk, **kwargs), chunks))
+        else:
+            results = [method(chunk, **kwargs) for chunk in chunks]
+        results = [result for chunk_results in results for result in chunk_results]
+        return converter(results) if converter is not None else results
+
+
+@coroutine_endpoints
+class AsyncSpotify(SpotifyBase):
+    """
+    asyncio version of Spotify. Every endpoint method is a coroutine function with the same signature,
+    and paging objects are AsyncPaging, AsyncCustomPaging or AsyncCursorBasedPaging.
+    """
+
+    paging_class = AsyncPaging
+    custom_paging_class = AsyncCustomPaging
+    cursor_based_paging_class = AsyncCursorBasedPaging
+
+    async def __request__(self, url, converter=None, data=None, method='GET'):
+        response = await async_http_request(self.authorization, url, data=data, method=method, timeout=self.timeout)
+        return converter(response) if converter is not None else response
+
+    async def _batch_load(self, method, entity_id, **kwargs):
+        loader_key = (method.__func__,) + tuple(sorted(kwargs.items()))
+        loader = self._loaders.get(loader_key)
+        if loader is None:
+            loader = self._loaders[loader_key] = AsyncBatchLoader(
+                lambda ids: method(ids, **kwargs), window=self.batch_window
+            )
+        result = await loader.load(entity_id)
+        if result is None:
+            raise HTTPError('Not Found', 404)
+        return result
+
+    async def _fetch_in_chunks(self, method, ids, chunk_size, parallelism, converter=None, **kwargs):
+        semaphore = asyncio.Semaphore(max(parallelism, 1))
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await method(chunk, **kwargs)
+
+        results = await asyncio.gather(*[fetch(chunk) for chunk in chunked(ids, chunk_size)])
+        results = [result for chunk_results in results for result in chunk_results]
+        return converter(results) if converter is not None else results
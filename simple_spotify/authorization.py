@@ -1,16 +1,84 @@
 import base64
+import hashlib
+import io
 import json
+import socket
+import threading
+import time
 import urllib.error
 import urllib.parse
-import urllib.request
 
 from datetime import datetime
+from types import MappingProxyType
+
+from .errors import RequestTimeoutError
+from .pool import DEFAULT_TIMEOUT, get_pool
+from .ratelimit import RateLimiter
+from .tokenstore import get_token_store
 
 
 ENDPOINT_TOKEN = 'https://accounts.spotify.com/api/token'
 
+CREATED_AT_FORMAT = '%Y%m%d%H%M%S'
+
 
 class SpotifyAuthBase:
+    @property
+    def access_token(self):
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, access_token):
+        self._access_token = access_token
+        # built once per token, read-only so that concurrent requests can share it
+        self._authorization = MappingProxyType({'Authorization': 'Bearer {}'.format(access_token)})
+
+    @property
+    def authorization(self):
+        return self._authorization
+
+    @classmethod
+    def expiry_from_created_at(cls, created_at, expires_in):
+        """
+        Convert a serialized created_at into an expiry on the time.monotonic() clock,
+        which does not jump with the wall clock.
+        :param created_at: Local time the token was issued, in CREATED_AT_FORMAT
+        :param expires_in: Lifetime of the token in seconds
+        :return: float
+        """
+        age = (datetime.now() - datetime.strptime(created_at, CREATED_AT_FORMAT)).total_seconds()
+        return time.monotonic() + expires_in - age
+
+    @classmethod
+    def token_fresh(cls, token, refresh_margin=60):
+        """
+        :param token: dict with created_at and expires_in
+        :return: True if the token does not expire within refresh_margin seconds
+        """
+        expires_at = cls.expiry_from_created_at(token['created_at'], token['expires_in'])
+        return time.monotonic() < expires_at - refresh_margin
+
+    @classmethod
+    def token_key(cls, secret):
+        # tokens are stored under a digest, so that the store does not hold client secrets or refresh tokens
+        return '{flow} {digest}'.format(flow=cls.__name__, digest=hashlib.sha1(secret.encode('utf-8')).hexdigest())
+
+    @property
+    def token(self):
+        return {
+            'access_token': self.access_token,
+            'token_type': self.token_type,
+            'scope': self.scope,
+            'expires_in': self.expires_in,
+            'created_at': self.created_at,
+        }
+
+    def use_token(self, token):
+        self.expires_in = token['expires_in']
+        self.created_at = token['created_at']
+        self.access_token = token['access_token']
+        self.expires_at = self.expiry_from_created_at(token['created_at'], token['expires_in'])
+
     @classmethod
     def get_header_param(cls, client_id, client_secret):
         base64string = base64.encodebytes('{client_id}:{client_secret}'.format(
@@ -23,38 +91,124 @@ class SpotifyAuthBase:
         ).replace('\n', '')  # trailing \n in base64string
         return {'Authorization': authorization}
 
+    def select(self):
+        """
+        Pick the credential which sends the next request.
+        :return: (auth object, its RateLimiter or None for the process-wide one)
+        """
+        return self, None
+
+    def refresh_if_expired(self):
+        """
+        Refresh the access token if expired() is True.
+        When several threads call this at once, one of them refreshes and the others wait for it.
+        """
+        if not self.expired():
+            return
+        with self._refresh_lock:
+            # another thread may have refreshed the token while this one was waiting
+            if not self.expired():
+                return
+            store = get_token_store()
+            if store is None:
+                self.token_refresh()
+                return
+
+            def fetch():
+                self.token_refresh()
+                return self.token
+
+            self.use_token(store.refresh(
+                self.store_key, lambda token: self.token_fresh(token, self.refresh_margin), fetch
+            ))
+
     @classmethod
     def get_response(cls, headers, request_body):
         data = urllib.parse.urlencode(request_body).encode('ascii')
-        req = urllib.request.Request(ENDPOINT_TOKEN, data, headers=headers)
+        headers = dict(headers)
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
         try:
-            with urllib.request.urlopen(req) as res:
-                res = json.loads(res.read().decode('utf-8'))
-        except urllib.error.HTTPError as e:
-            raise e
-        return res
+            res = get_pool().urlopen('POST', ENDPOINT_TOKEN, body=data, headers=headers, timeout=DEFAULT_TIMEOUT)
+        except socket.timeout:
+            raise RequestTimeoutError('Timed out: {url}'.format(url=ENDPOINT_TOKEN))
+        except OSError as e:
+            raise urllib.error.URLError(e)
+        if res.status >= 400:
+            raise urllib.error.HTTPError(ENDPOINT_TOKEN, res.status, res.reason, res.headers, io.BytesIO(res.body))
+        return json.loads(res.body.decode('utf-8'))
 
 
 class ClientCredentialsFlow(SpotifyAuthBase):
-    def __init__(self, access_token, token_type, expires_in, scope):
+    def __init__(self, access_token, token_type, expires_in, scope, headers=None, refresh_margin=60,
+                 created_at=None):
+        """
+        :param headers: Optional. Authorization header of the client, as returned by token_request.
+               A new access token is requested with it once the current one expires.
+               Without it the access token is never renewed.
+        :param refresh_margin: Optional. Seconds before expiry from which the access token is renewed. Default 60.
+        :param created_at: Optional. Local time the token was issued, in CREATED_AT_FORMAT. Default now.
+        """
         self.access_token = access_token
         self.token_type = token_type
         self.expires_in = expires_in
         self.scope = scope
-
-    @property
-    def authorization(self):
-        return {'Authorization': 'Bearer {}'.format(self.access_token)}
+        self.headers = headers
+        self.refresh_margin = refresh_margin
+        if created_at is None:
+            self.created_at = datetime.now().strftime(CREATED_AT_FORMAT)
+            self.expires_at = time.monotonic() + expires_in
+        else:
+            self.created_at = created_at
+            self.expires_at = self.expiry_from_created_at(created_at, expires_in)
+        self._refresh_lock = threading.Lock()
 
     @classmethod
     def token_request(cls, client_id, client_secret):
+        """
+        Request an access token. If a token store is set, a fresh token of the same client
+        stored by another process is returned instead.
+        """
         headers = cls.get_header_param(client_id, client_secret)
-        request_body = {'grant_type': 'client_credentials'}
-        return cls.get_response(headers, request_body)
+
+        def fetch():
+            response = cls.get_response(headers, {'grant_type': 'client_credentials'})
+            response['created_at'] = datetime.now().strftime(CREATED_AT_FORMAT)
+            return response
+
+        store = get_token_store()
+        if store is None:
+            response = fetch()
+        else:
+            response = store.refresh(cls.token_key(headers['Authorization']), cls.token_fresh, fetch)
+        response['headers'] = headers
+        return response
+
+    @property
+    def store_key(self):
+        return self.token_key(self.headers['Authorization'])
+
+    def token_refresh(self):
+        issued_at = time.monotonic()
+        response = self.get_response(self.headers, {'grant_type': 'client_credentials'})
+        self.expires_in = response['expires_in']
+        self.created_at = datetime.now().strftime(CREATED_AT_FORMAT)
+        self.access_token = response['access_token']
+        self.expires_at = issued_at + self.expires_in
+
+    def expired(self):
+        """
+        :return: True if the access token can be renewed and expires within refresh_margin seconds
+        """
+        return self.headers is not None and time.monotonic() > self.expires_at - self.refresh_margin
 
 
 class AuthorizationCodeFlow(SpotifyAuthBase):
-    def __init__(self, access_token, created_at, expires_in, scope, refresh_token, headers, token_type):
+    def __init__(self, access_token, created_at, expires_in, scope, refresh_token, headers, token_type,
+                 refresh_margin=60):
+        """
+        :param refresh_margin: Optional. Seconds before expiry from which the access token is refreshed,
+               so that no request is sent with a token about to expire. Default 60.
+        """
         self.access_token = access_token
         self.expires_in = expires_in
         self.scope = scope
@@ -62,10 +216,9 @@ class AuthorizationCodeFlow(SpotifyAuthBase):
         self.created_at = created_at
         self.headers = headers
         self.token_type = token_type
-
-    @property
-    def authorization(self):
-        return {'Authorization': 'Bearer {}'.format(self.access_token)}
+        self.refresh_margin = refresh_margin
+        self.expires_at = self.expiry_from_created_at(created_at, expires_in)
+        self._refresh_lock = threading.Lock()
 
     @classmethod
     def token_request(cls, client_id, client_secret, redirect_uri, code):
@@ -77,13 +230,91 @@ class AuthorizationCodeFlow(SpotifyAuthBase):
         }
         response = cls.get_response(headers, request_body)
         response['headers'] = headers
-        response['created_at'] = datetime.now().strftime('%Y%m%d%H%M%S')
+        response['created_at'] = datetime.now().strftime(CREATED_AT_FORMAT)
         return response
 
+    @property
+    def store_key(self):
+        return self.token_key(self.refresh_token)
+
     def token_refresh(self):
         request_body = {
             'grant_type': 'refresh_token',
             'refresh_token': self.refresh_token,
         }
-        self.access_token = self.get_response(self.headers, request_body)['access_token']
-        self.created_at = datetime.now().strftime('%Y%m%d%H%M%S')
+        issued_at = time.monotonic()
+        response = self.get_response(self.headers, request_body)
+        self.expires_in = response.get('expires_in', self.expires_in)
+        self.created_at = datetime.now().strftime(CREATED_AT_FORMAT)
+        self.access_token = response['access_token']
+        self.expires_at = issued_at + self.expires_in
+
+    def expired(self):
+        """
+        :return: True if the access token has expired or expires within refresh_margin seconds
+        """
+        return time.monotonic() > self.expires_at - self.refresh_margin
+
+
+class CredentialPool:
+    """
+    Several ClientCredentialsFlow objects, i.e. several client applications, used as one authorization.
+    Each request is sent with the least throttled credential. A credential which gets a 429 response is
+    out of rotation until its Retry-After has passed, and the request is sent again with another one.
+    Every credential has its own RateLimiter in place of the process-wide one.
+    :param credentials: List of ClientCredentialsFlow objects
+    :param rate: Optional. Requests per second of each credential. Default None, only Retry-After is applied.
+    :param burst: Optional. Bucket size of each credential. Default rate.
+    """
+
+    def __init__(self, credentials, rate=None, burst=None):
+        if not credentials:
+            raise ValueError('credentials must not be empty.')
+        self.credentials = list(credentials)
+        max_retries = len(self.credentials) * 2
+        self.rate_limiters = [RateLimiter(rate, burst, max_retries) for _ in self.credentials]
+        self.requests = [0] * len(self.credentials)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def token_request(cls, clients, rate=None, burst=None):
+        """
+        :param clients: List of (client_id, client_secret)
+        :return: CredentialPool object
+        """
+        credentials = [
+            ClientCredentialsFlow(**ClientCredentialsFlow.token_request(client_id, client_secret))
+            for client_id, client_secret in clients
+        ]
+        return cls(credentials, rate, burst)
+
+    @property
+    def stats(self):
+        """
+        :return: List of dicts of requests, throttled_responses, throttle_time and queue_depth, one per credential
+        """
+        stats = []
+        for requests, rate_limiter in zip(self.requests, self.rate_limiters):
+            credential_stats = {'requests': requests}
+            credential_stats.update(rate_limiter.stats)
+            stats.append(credential_stats)
+        return stats
+
+    def select(self):
+        with self._lock:
+            # credentials out of rotation sort after the others, then the least used one goes first
+            index = min(
+                range(len(self.credentials)),
+                key=lambda i: (self.rate_limiters[i].paused_for,
+                               self.rate_limiters[i].queue_depth,
+                               self.requests[i])
+            )
+            self.requests[index] += 1
+        return self.credentials[index], self.rate_limiters[index]
+
+    def expired(self):
+        return any(credential.expired() for credential in self.credentials)
+
+    def refresh_if_expired(self):
+        for credential in self.credentials:
+            credential.refresh_if_expired()
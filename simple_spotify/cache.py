@@ -0,0 +1,364 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from collections import OrderedDict
+
+
+# (path pattern, seconds). The first matching pattern decides the TTL of a GET endpoint, 0 disables caching.
+DEFAULT_TTLS = (
+    (r'^/v1/recommendations$', 0),
+    (r'^/v1/(albums|artists|tracks|audio-features|audio-analysis)(/|$)', 24 * 60 * 60),
+    (r'^/v1/recommendations/available-genre-seeds$', 24 * 60 * 60),
+    (r'^/v1/browse/', 60 * 60),
+    (r'^/v1/me(/|$)', 60),
+)
+
+USER_SCOPED_PATH = re.compile(r'^/v1/me(/|$)')
+
+
+class CacheEntry:
+    def __init__(self, body, expires_at, etag=None, last_modified=None):
+        self.body = body
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self._value = None
+
+    @property
+    def value(self):
+        if self._value is None:
+            self._value = json.loads(self.body.decode('utf-8'))
+        return self._value
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.expires_at
+
+    @property
+    def validators(self):
+        """
+        Headers of a conditional GET for this entry.
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class LRUCache:
+    """
+    In-memory cache backend which evicts the least recently used entry when full.
+    :param maxsize: Maximum number of entries.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk cache backend in a SQLite database. It can be shared by several processes on one host.
+    Response bodies are stored as raw bytes, the least recently used entries are evicted once the
+    bodies take more than max_bytes.
+    :param path: Path of the database file.
+    :param max_bytes: Optional. Maximum total size of the stored bodies. Default 256MiB.
+    :param timeout: Optional. Seconds to wait for a lock held by another process. Default 30.
+    """
+
+    # accessed_at is only rewritten when it is older than this, so that reads rarely need a write lock
+    touch_interval = 60
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, timeout=30):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.evictions = 0
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, body BLOB NOT NULL, expires_at REAL NOT NULL, '
+                'etag TEXT, last_modified TEXT, size INTEGER NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS total_size (size INTEGER NOT NULL)')
+            if conn.execute('SELECT COUNT(*) FROM total_size').fetchone()[0] == 0:
+                conn.execute('INSERT INTO total_size VALUES (0)')
+
+    @property
+    def connection(self):
+        # sqlite3 connections can be used neither from other threads nor after fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self.connection)
+
+    def get(self, key):
+        conn = self.connection
+        row = conn.execute(
+            'SELECT body, expires_at, etag, last_modified, accessed_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, expires_at, etag, last_modified, accessed_at = row
+        now = time.time()
+        if now - accessed_at > self.touch_interval:
+            conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        return CacheEntry(body, expires_at, etag, last_modified)
+
+    def set(self, key, entry):
+        size = len(entry.body)
+        with self._transaction() as conn:
+            self._delete(conn, key)
+            conn.execute(
+                'INSERT INTO responses (key, body, expires_at, etag, last_modified, size, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(entry.body), entry.expires_at, entry.etag, entry.last_modified,
+                 size, time.time())
+            )
+            conn.execute('UPDATE total_size SET size = size + ?', (size,))
+            self._evict(conn)
+
+    def _delete(self, conn, key):
+        row = conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return 0
+        conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+        conn.execute('UPDATE total_size SET size = size - ?', (row[0],))
+        return 1
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT size FROM total_size').fetchone()[0]
+        while total > self.max_bytes:
+            rows = conn.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64'
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                conn.execute('UPDATE total_size SET size = size - ?', (size,))
+                total -= size
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._transaction() as conn:
+            self._delete(conn, key)
+
+    def delete_prefix(self, prefix):
+        with self._transaction() as conn:
+            rows = conn.execute(
+                'SELECT key FROM responses WHERE substr(key, 1, ?) = ?', (len(prefix), prefix)
+            ).fetchall()
+            for key, in rows:
+                self._delete(conn, key)
+        return len(rows)
+
+    def clear(self):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM responses')
+            conn.execute('UPDATE total_size SET size = 0')
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        # take the write lock up front, so that concurrent writers wait instead of failing on upgrade
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.conn.execute('COMMIT')
+        else:
+            self.conn.execute('ROLLBACK')
+
+
+class ResponseCache:
+    """
+    Cache of GET responses keyed on the full request URL.
+    Responses of endpoints under /v1/me are also keyed on the user of the authorization.
+    Stale responses with an ETag or Last-Modified header are revalidated with a conditional GET.
+    PUT, POST and DELETE requests are never cached and invalidate the cached responses under their path.
+    :param backend: Optional. Cache backend. Default LRUCache().
+    :param ttls: Optional. Sequence of (path regex, seconds). Default DEFAULT_TTLS.
+    :param default_ttl: Optional. TTL of endpoints which match none of ttls. Default 300 seconds.
+    """
+
+    def __init__(self, backend=None, ttls=DEFAULT_TTLS, default_ttl=300):
+        self.backend = backend if backend is not None else LRUCache()
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': getattr(self.backend, 'evictions', 0),
+            'invalidations': self.invalidations,
+        }
+
+    def ttl(self, url):
+        path = urllib.parse.urlsplit(url).path
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    @classmethod
+    def scope(cls, authorization, url):
+        if not USER_SCOPED_PATH.search(urllib.parse.urlsplit(url).path):
+            return ''
+        # refresh_token stays the same across token refreshes of AuthorizationCodeFlow
+        identity = getattr(authorization, 'refresh_token', None) or authorization.access_token
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def key(self, authorization, url):
+        return '{scope} {url}'.format(scope=self.scope(authorization, url), url=url)
+
+    def lookup(self, authorization, url):
+        """
+        :return: CacheEntry object which is fresh, or stale but can be revalidated. Otherwise None.
+        """
+        if not self.ttl(url):
+            return None
+        entry = self.backend.get(self.key(authorization, url))
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.is_fresh():
+            self.hits += 1
+            return entry
+        self.misses += 1
+        if entry.validators:
+            # revalidated() turns the miss into a hit if the server answers 304
+            return entry
+        return None
+
+    def get(self, authorization, url):
+        """
+        :return: Parsed response or None
+        """
+        entry = self.lookup(authorization, url)
+        if entry is None:
+            return None
+        if not entry.is_fresh():
+            return None
+        return entry.value
+
+    def set(self, authorization, url, body, headers=None):
+        """
+        :param headers: Optional. Response headers, ETag and Last-Modified are kept for revalidation.
+        """
+        ttl = self.ttl(url)
+        if not ttl:
+            return
+        headers = headers or {}
+        entry = CacheEntry(body, time.time() + ttl, headers.get('ETag'), headers.get('Last-Modified'))
+        self.backend.set(self.key(authorization, url), entry)
+
+    def revalidated(self, authorization, url, entry, headers=None):
+        """
+        Renew a stale entry after a 304 Not Modified response. It counts as a hit.
+        :return: Parsed response
+        """
+        headers = headers or {}
+        entry.expires_at = time.time() + self.ttl(url)
+        entry.etag = headers.get('ETag') or entry.etag
+        entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+        self.backend.set(self.key(authorization, url), entry)
+        self.misses -= 1
+        self.hits += 1
+        self.revalidations += 1
+        return entry.value
+
+    def invalidate(self, authorization, url):
+        """
+        Drop cached responses under the path of url, e.g. after PUT /v1/me/tracks
+        cached /v1/me/tracks and /v1/me/tracks/contains responses of the same user.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        path_url = urllib.parse.urlunsplit((parsed.scheme, parsed.netloc, parsed.path, '', ''))
+        self.invalidations += self.backend.delete_prefix(self.key(authorization, path_url))
+
+    def clear(self):
+        self.backend.clear()
+
+
+_default_cache = None
+
+
+def get_cache():
+    return _default_cache
+
+
+def set_cache(cache):
+    """
+    Enable response caching for every Spotify and AsyncSpotify request. None disables it.
+    :param cache: ResponseCache object or None
+    """
+    global _default_cache
+    _default_cache = cache
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+
+
+def load_checkpoint(path):
+    """
+    :param path: Path of a checkpoint file written by save_checkpoint
+    :return: Checkpoint dict, or None if the file does not exist
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path, checkpoint):
+    """
+    Write a checkpoint atomically, so that a crash while writing leaves the previous one in place.
+    :param path: Path of the checkpoint file
+    :param checkpoint: Return value of checkpoint() of a paging object
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def remove_checkpoint(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def checkpointed_pages(paging, path, every=10, parallelism=1, prefetch=0):
+    """
+    Iterate over the pages of paging, resuming from the checkpoint file at path if there is one.
+    The checkpoint is saved every `every` pages once the consumer is done with a page. It is removed after the last
+    page, so that the next run starts from the first page again. An interrupted run leaves it in place.
+    :param paging: Paging, CustomPaging or CursorBasedPaging object of the first page
+    :param path: Path of the checkpoint file
+    :param every: Optional. Number of pages between two saves. Default 10.
+    :param parallelism: Optional. See PagingBase.iter_pages. Default 1.
+    :param prefetch: Optional. See PagingBase.iter_pages. Default 0.
+    :return: generator of paging objects
+    """
+    pages = paging.iter_pages(parallelism, prefetch, load_checkpoint(path))
+    for count, page in enumerate(pages, 1):
+        yield page
+        if count % every == 0:
+            save_checkpoint(path, page.checkpoint())
+    remove_checkpoint(path)
+
+
+async def async_checkpointed_pages(paging, path, every=10, parallelism=1, prefetch=0):
+    """
+    Coroutine version of checkpointed_pages for the paging objects of AsyncSpotify, used with `async for`.
+    """
+    count = 0
+    pages = paging.iter_pages(parallelism, prefetch, load_checkpoint(path))
+    try:
+        async for page in pages:
+            yield page
+            count += 1
+            if count % every == 0:
+                save_checkpoint(path, page.checkpoint())
+    finally:
+        await pages.aclose()
+    remove_checkpoint(path)
@@ -0,0 +1,240 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .consts import AUDIO_FEATURE_ATTRS
+from .decorators import ATTR_PAT
+from .errors import RecommendationAttributeError
+
+
+def require_numpy():
+    if numpy is None:
+        raise ImportError('numpy is required for columnar data. Install it with pip install simple_spotify[numpy].')
+
+
+def parse_attributes(attributes, columns, prefixes=('min_', 'max_', 'target_')):
+    """
+    Split keyword arguments in the grammar of the tuneable attributes of get_recommendations.
+    :param attributes: dict such as {'min_energy': 0.5, 'target_tempo': 120}
+    :param columns: Accepted attribute names
+    :param prefixes: Optional. Accepted prefixes.
+    :return: List of (prefix, attr, value)
+    """
+    parsed = []
+    for name, value in attributes.items():
+        match = ATTR_PAT.search(name)
+        if match is None or match.group('prefix') not in prefixes or match.group('attr') not in columns:
+            raise RecommendationAttributeError('Invalid Tuneable attribution: {name}'.format(name=name))
+        parsed.append((match.group('prefix'), match.group('attr'), value))
+    return parsed
+
+
+class Columns:
+    """
+    Fields of a list of audio analysis objects as NumPy arrays, one array per field.
+    :param raw_items: List of dicts, e.g. the raw 'segments' of an audio analysis.
+    """
+
+    # (field, dtype) of the one-dimensional columns
+    fields = ()
+    # (field, dtype, width) of the columns which are vectors per item
+    vector_fields = ()
+
+    def __init__(self, raw_items):
+        require_numpy()
+        count = len(raw_items)
+        self.count = count
+        for field, dtype in self.fields:
+            setattr(self, field, numpy.fromiter((item[field] for item in raw_items), dtype, count))
+        for field, dtype, width in self.vector_fields:
+            matrix = numpy.array([item[field] for item in raw_items], dtype=dtype).reshape(count, width)
+            setattr(self, field, matrix)
+
+    def __len__(self):
+        return self.count
+
+
+class IntervalColumns(Columns):
+    """
+    Columns of bars, beats or tatums.
+    """
+
+    fields = (
+        ('start', 'float64'),
+        ('duration', 'float64'),
+        ('confidence', 'float32'),
+    )
+
+
+class SectionColumns(Columns):
+    fields = IntervalColumns.fields + (
+        ('loudness', 'float32'),
+        ('tempo', 'float32'),
+        ('tempo_confidence', 'float32'),
+        ('key', 'int8'),
+        ('key_confidence', 'float32'),
+        ('mode', 'int8'),
+        ('mode_confidence', 'float32'),
+        ('time_signature', 'int8'),
+        ('time_signature_confidence', 'float32'),
+    )
+
+
+class SegmentColumns(Columns):
+    """
+    Columns of segments. pitches and timbre are (N, 12) float32 matrices.
+    """
+
+    fields = IntervalColumns.fields + (
+        ('loudness_start', 'float32'),
+        ('loudness_max', 'float32'),
+        ('loudness_max_time', 'float32'),
+        ('loudness_end', 'float32'),
+    )
+    vector_fields = (
+        ('pitches', 'float32', 12),
+        ('timbre', 'float32', 12),
+    )
+
+
+class ColumnarAudioAnalysis:
+    """
+    Columnar view of an audio analysis. Each group is converted on first access.
+    :param raw_json: Raw audio analysis response
+    """
+
+    def __init__(self, raw_json):
+        require_numpy()
+        self.raw = raw_json
+        self._columns = {}
+
+    def _get(self, key, columns_class):
+        columns = self._columns.get(key)
+        if columns is None:
+            columns = self._columns[key] = columns_class(self.raw[key])
+        return columns
+
+    @property
+    def bars(self):
+        return self._get('bars', IntervalColumns)
+
+    @property
+    def beats(self):
+        return self._get('beats', IntervalColumns)
+
+    @property
+    def sections(self):
+        return self._get('sections', SectionColumns)
+
+    @property
+    def segments(self):
+        return self._get('segments', SegmentColumns)
+
+    @property
+    def tatums(self):
+        return self._get('tatums', IntervalColumns)
+
+
+class AudioFeatureMatrix:
+    """
+    Audio features of several tracks as one contiguous (N, F) float64 array, a row per track and
+    a column per attribute of attrs. Rows of unknown tracks are NaN.
+    numpy.asarray(matrix) returns the array without copying it.
+    :param track_ids: List of the Spotify IDs of the rows
+    :param values: (N, F) array
+    :param attrs: Optional. Attribute of each column. Default AUDIO_FEATURE_ATTRS.
+    """
+
+    def __init__(self, track_ids, values, attrs=AUDIO_FEATURE_ATTRS):
+        require_numpy()
+        self.track_ids = list(track_ids)
+        self.values = numpy.ascontiguousarray(values, dtype='float64')
+        self.attrs = tuple(attrs)
+        self.columns = {attr: i for i, attr in enumerate(self.attrs)}
+        self.index = {track_id: i for i, track_id in enumerate(self.track_ids)}
+
+    @classmethod
+    def from_features(cls, features, track_ids=None, attrs=AUDIO_FEATURE_ATTRS):
+        """
+        :param features: List of AudioFeature objects or None, e.g. the result of get_audio_features
+        :param track_ids: Optional. Requested IDs in the order of features, which keeps a NaN row for each None.
+                          Default None, None entries are dropped.
+        :return: AudioFeatureMatrix object
+        """
+        require_numpy()
+        if track_ids is None:
+            features = [feature for feature in features if feature is not None]
+            track_ids = [feature.track_id for feature in features]
+        values = numpy.full((len(features), len(attrs)), numpy.nan)
+        for row, feature in enumerate(features):
+            if feature is not None:
+                raw = feature.raw
+                values[row] = [raw[attr] for attr in attrs]
+        return cls(track_ids, values, attrs)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or numpy.dtype(dtype) == self.values.dtype:
+            return self.values
+        return self.values.astype(dtype)
+
+    def __len__(self):
+        return len(self.track_ids)
+
+    def __contains__(self, track_id):
+        return track_id in self.index
+
+    def __getitem__(self, track_id):
+        """
+        :return: Row of track_id, a view into values
+        """
+        return self.values[self.index[track_id]]
+
+    def column(self, attr):
+        """
+        :return: Column of attr, a view into values
+        """
+        return self.values[:, self.columns[attr]]
+
+    @property
+    def known(self):
+        """
+        :return: Boolean array, False for the rows of unknown tracks
+        """
+        return ~numpy.isnan(self.values).all(axis=1)
+
+    def take(self, rows):
+        """
+        :param rows: Boolean mask or integer indices of rows
+        :return: AudioFeatureMatrix object of the rows
+        """
+        rows = numpy.asarray(rows)
+        if rows.dtype == bool:
+            rows = numpy.flatnonzero(rows)
+        return type(self)([self.track_ids[row] for row in rows], self.values[rows], self.attrs)
+
+    def mask(self, **conditions):
+        """
+        :param conditions: min_<attr> and max_<attr> bounds, inclusive, e.g. min_energy=0.5, max_tempo=130
+        :return: Boolean array of the rows which satisfy every condition. Unknown tracks never do.
+        """
+        mask = self.known
+        for prefix, attr, value in parse_attributes(conditions, self.columns, ('min_', 'max_')):
+            column = self.column(attr)
+            mask &= column >= value if prefix == 'min_' else column <= value
+        return mask
+
+    def filter(self, **conditions):
+        """
+        :param conditions: See mask
+        :return: AudioFeatureMatrix object of the rows which satisfy every condition
+        """
+        return self.take(self.mask(**conditions))
+
+    def sort_by(self, attr, descending=False):
+        """
+        :return: AudioFeatureMatrix object sorted by attr. Unknown tracks come last.
+        """
+        column = self.column(attr)
+        order = numpy.argsort(-column if descending else column, kind='stable')
+        return self.take(order)
@@ -43,6 +43,26 @@ TUNEABLE_ATTRS = (
     'valence'
 )
 
+# TUNEABLE_ATTRS which are fields of audio features, i.e. all but popularity
+AUDIO_FEATURE_ATTRS = tuple(attr for attr in TUNEABLE_ATTRS if attr != 'popularity')
+
+# (lowest, highest) value of each attribute in AUDIO_FEATURE_ATTRS, to scale them to [0, 1]
+AUDIO_FEATURE_RANGES = {
+    'acousticness': (0, 1),
+    'danceability': (0, 1),
+    'duration_ms': (0, 900000),
+    'energy': (0, 1),
+    'instrumentalness': (0, 1),
+    'key': (0, 11),
+    'liveness': (0, 1),
+    'loudness': (-60, 0),
+    'mode': (0, 1),
+    'speechiness': (0, 1),
+    'tempo': (0, 250),
+    'time_signature': (3, 7),
+    'valence': (0, 1),
+}
+
 GENRE_SEEDS = [
     'acoustic',
     'afrobeat',
@@ -10,6 +10,12 @@ class HTTPError(Exception):
         )
 
 
+class RateLimitError(HTTPError):
+    def __init__(self, reason, code, retry_after=None):
+        super(RateLimitError, self).__init__(reason, code)
+        self.retry_after = retry_after
+
+
 class ExceptionBase(Exception):
     def __init__(self, reason):
         self.reason = reason
@@ -32,3 +38,7 @@ class PathParameterError(ExceptionBase):
 
 class RecommendationAttributeError(ExceptionBase):
     pass
+
+
+class RequestTimeoutError(ExceptionBase):
+    pass
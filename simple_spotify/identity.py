@@ -0,0 +1,105 @@
+import sys
+
+
+# values which repeat across many objects, e.g. 'track' or 'JP'
+INTERNED_KEYS = frozenset(('id', 'uri', 'type', 'country', 'market'))
+
+
+class IdentityMap:
+    """
+    Shares entities which appear in several responses. While it is set with set_identity_map, every object with
+    an id and a type, such as the simplified artists nested in tracks and albums, is kept once per shape:
+    a nested copy whose content equals the kept one is replaced by it, and to_object returns the same model
+    object for it. A copy with different content, e.g. a newer popularity, replaces the kept one.
+    IDs, URIs, types and market codes are interned, and equal available_markets lists are shared.
+    """
+
+    def __init__(self):
+        self._entities = {}
+        self._objects = {}
+        self._shapes = {}
+        self._markets = {}
+
+    def __len__(self):
+        return len(self._entities)
+
+    def clear(self):
+        self._entities = {}
+        self._objects = {}
+        self._shapes = {}
+        self._markets = {}
+
+    def share(self, response):
+        """
+        Replace the entities nested in a decoded response by equal ones already in the map, in place.
+        The response itself is kept, it only becomes the entity of the map if it is one.
+        :param response: Decoded JSON response
+        :return: response
+        """
+        if isinstance(response, dict):
+            self._share_dict(response)
+        elif isinstance(response, list):
+            self._share_list(response)
+        return response
+
+    def _share_list(self, items):
+        for i, item in enumerate(items):
+            if isinstance(item, dict):
+                items[i] = self._share_dict(item)
+            elif isinstance(item, list):
+                self._share_list(item)
+
+    def _share_dict(self, raw):
+        for name, value in raw.items():
+            if name in INTERNED_KEYS and isinstance(value, str):
+                raw[name] = sys.intern(value)
+            elif name == 'available_markets' and isinstance(value, list):
+                markets = tuple(sys.intern(market) for market in value)
+                raw[name] = self._markets.setdefault(markets, list(markets))
+            elif isinstance(value, dict):
+                raw[name] = self._share_dict(value)
+            elif isinstance(value, list):
+                self._share_list(value)
+        key = self._key(raw)
+        if key is None:
+            return raw
+        shared = self._entities.get(key)
+        # nested entities are shared already, so equal copies compare by identity below the top level
+        if shared is not None and shared == raw:
+            return shared
+        self._entities[key] = raw
+        return raw
+
+    def _key(self, raw):
+        if not isinstance(raw.get('id'), str) or 'type' not in raw:
+            return None
+        shape = tuple(raw)
+        return raw['type'], raw['id'], self._shapes.setdefault(shape, shape)
+
+    def to_object(self, cls, raw_json):
+        """
+        :return: The cls object of raw_json, the same one for every call with the entity kept in the map
+        """
+        key = self._key(raw_json)
+        if key is None or self._entities.get(key) is not raw_json:
+            return cls(raw_json)
+        obj = self._objects.get((cls, key))
+        if obj is None or obj.raw is not raw_json:
+            obj = self._objects[(cls, key)] = cls(raw_json)
+        return obj
+
+
+_default_identity_map = None
+
+
+def get_identity_map():
+    return _default_identity_map
+
+
+def set_identity_map(identity_map):
+    """
+    Share the entities of the following responses through identity_map. None disables sharing.
+    :param identity_map: IdentityMap object
+    """
+    global _default_identity_map
+    _default_identity_map = identity_map
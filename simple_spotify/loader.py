@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class BatchLoader:
+    """
+    Coalesce single-key lookups made from several threads into batch calls.
+    The first load() of a batch waits `window` seconds for other keys, then calls batch_fn once
+    with all collected keys. A key which is already pending or in flight is not requested again.
+    :param batch_fn: Callable which takes a list of keys and returns a list of values in the same order.
+    :param max_batch_size: Maximum number of keys for one batch_fn call.
+    :param window: Seconds to collect keys before dispatching a batch.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=50, window=0.005):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._in_flight = {}
+        self._generation = 0
+
+    def load(self, key):
+        batch = None
+        leader = False
+        with self._lock:
+            future = self._pending.get(key) or self._in_flight.get(key)
+            if future is None:
+                future = self._pending[key] = Future()
+                generation = self._generation
+                if len(self._pending) >= self.max_batch_size:
+                    batch = self._take_batch()
+                else:
+                    leader = len(self._pending) == 1
+
+        if leader:
+            if self.window:
+                time.sleep(self.window)
+            with self._lock:
+                if self._generation == generation:
+                    batch = self._take_batch()
+        if batch:
+            self._dispatch(batch)
+        return future.result()
+
+    def _take_batch(self):
+        batch, self._pending = self._pending, OrderedDict()
+        self._in_flight.update(batch)
+        self._generation += 1
+        return batch
+
+    def _dispatch(self, batch):
+        keys = list(batch)
+        try:
+            values = self.batch_fn(keys)
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+        else:
+            for key, value in zip(keys, values):
+                batch[key].set_result(value)
+        finally:
+            with self._lock:
+                for key in keys:
+                    if self._in_flight.get(key) is batch[key]:
+                        del self._in_flight[key]
+
+
+class AsyncBatchLoader:
+    """
+    Coalesce single-key lookups made on one event loop into batch calls.
+    Keys passed to load() within `window` seconds, or within the same loop iteration if window is 0,
+    are resolved by one await of batch_fn. A key which is already pending or in flight is not requested again.
+    :param batch_fn: Coroutine function which takes a list of keys and returns a list of values in the same order.
+    :param max_batch_size: Maximum number of keys for one batch_fn call.
+    :param window: Seconds to collect keys before dispatching a batch.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=50, window=0):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending = OrderedDict()
+        self._in_flight = {}
+        self._generation = 0
+
+    async def load(self, key):
+        future = self._pending.get(key) or self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_event_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif len(self._pending) == 1:
+                loop.call_later(self.window, self._flush, self._generation)
+        # one cancelled caller must not cancel the lookup shared with the others
+        return await asyncio.shield(future)
+
+    def _flush(self, generation=None):
+        if generation is not None and generation != self._generation:
+            return
+        batch, self._pending = self._pending, OrderedDict()
+        self._in_flight.update(batch)
+        self._generation += 1
+        if batch:
+            asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        keys = list(batch)
+        try:
+            values = await self.batch_fn(keys)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for key, value in zip(keys, values):
+                if not batch[key].done():
+                    batch[key].set_result(value)
+        finally:
+            for key in keys:
+                if self._in_flight.get(key) is batch[key]:
+                    del self._in_flight[key]
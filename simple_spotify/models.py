@@ -1,12 +1,50 @@
+import asyncio
 import datetime
+import itertools
+import queue
+import threading
+import urllib.parse
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .columnar import ColumnarAudioAnalysis
 from .consts import PITCH_CLASS
-from .util import http_request
+from .identity import get_identity_map
+from .pool import Timeout
+from .util import async_http_request, http_request
+
+
+class memoized:
+    """
+    Property which is computed once per object, for values built from raw such as lists of wrapper objects.
+    It works with __slots__, the values are kept in the _memo slot of ObjectBase.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        memo = obj._memo
+        if memo is None:
+            memo = obj._memo = {}
+        try:
+            return memo[self.name]
+        except KeyError:
+            value = memo[self.name] = self.func(obj)
+            return value
 
 
 class ObjectBase:
+    __slots__ = ('raw', '_memo')
+
     def __init__(self, raw_json):
         self.raw = raw_json
+        self._memo = None
 
     @property
     def as_dict(self):
@@ -14,10 +52,14 @@ class ObjectBase:
 
     @classmethod
     def to_object(cls, raw_json):
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            return identity_map.to_object(cls, raw_json)
         return cls(raw_json)
 
 
 class SimplifiedObjectBase(ObjectBase):
+    __slots__ = ()
 
     @property
     def external_urls(self):
@@ -41,6 +83,7 @@ class SimplifiedObjectBase(ObjectBase):
 
 
 class SimplifiedAlbum(SimplifiedObjectBase):
+    __slots__ = ()
 
     def __str__(self):
         return self.name
@@ -53,7 +96,7 @@ class SimplifiedAlbum(SimplifiedObjectBase):
     def album_type(self):
         return self.raw['album_type']
 
-    @property
+    @memoized
     def artists(self):
         converter = SimplifiedArtist.to_object
         artists = []
@@ -69,7 +112,7 @@ class SimplifiedAlbum(SimplifiedObjectBase):
     def album_id(self):
         return self.raw['id']
 
-    @property
+    @memoized
     def images(self):
         images = []
         converter = Image.convert_to_image
@@ -91,13 +134,15 @@ class SimplifiedAlbum(SimplifiedObjectBase):
 
 
 class Album(SimplifiedAlbum):
+    __slots__ = ('auth', 'tracks')
 
-    def __init__(self, raw_json, auth):
+    def __init__(self, raw_json, auth=None, paging_class=None, timeout=None):
         super(Album, self).__init__(raw_json)
         self.auth = auth
-        self.tracks = Paging(self.raw['tracks'], SimplifiedTrack, self.auth)
+        paging_class = paging_class or Paging
+        self.tracks = paging_class(self.raw['tracks'], SimplifiedTrack, self.auth, timeout=timeout)
 
-    @property
+    @memoized
     def copyrights(self):
         copyrights = []
         converter = CopyRight.convert_to_copyright
@@ -105,7 +150,7 @@ class Album(SimplifiedAlbum):
             copyrights.append(converter(right))
         return copyrights
 
-    @property
+    @memoized
     def external_ids(self):
         return ExternalID(self.raw['external_ids'])
 
@@ -119,6 +164,7 @@ class Album(SimplifiedAlbum):
 
 
 class AudioFeature(ObjectBase):
+    __slots__ = ()
 
     @property
     def duration_ms(self):
@@ -206,6 +252,7 @@ class AudioFeature(ObjectBase):
 
 
 class SimplifiedArtist(SimplifiedObjectBase):
+    __slots__ = ()
 
     def __str__(self):
         return self.name
@@ -216,6 +263,7 @@ class SimplifiedArtist(SimplifiedObjectBase):
 
 
 class Artist(SimplifiedArtist):
+    __slots__ = ()
 
     @property
     def followers(self):
@@ -227,7 +275,7 @@ class Artist(SimplifiedArtist):
     def genres(self):
         return self.raw['genres']
 
-    @property
+    @memoized
     def images(self):
         images = []
         converter = Image.convert_to_image
@@ -241,11 +289,12 @@ class Artist(SimplifiedArtist):
 
 
 class SimplifiedTrack(SimplifiedObjectBase):
+    __slots__ = ()
 
     def __str__(self):
         return self.raw['name']
 
-    @property
+    @memoized
     def artists(self):
         converter = SimplifiedArtist.to_object
         artists = []
@@ -277,14 +326,14 @@ class SimplifiedTrack(SimplifiedObjectBase):
     def is_playable(self):
         return self.raw['is_playable']
 
-    @property
+    @memoized
     def linked_from(self):
         value = self.raw.get('linked_from')
         if value:
             return TrackLink(value)
         return value
 
-    @property
+    @memoized
     def restrictions(self):
         value = self.raw.get('restricitons')
         if value:
@@ -309,12 +358,13 @@ class SimplifiedTrack(SimplifiedObjectBase):
 
 
 class Track(SimplifiedTrack):
+    __slots__ = ()
 
-    @property
+    @memoized
     def album(self):
         return SimplifiedAlbum(self.raw['album'])
 
-    @property
+    @memoized
     def external_ids(self):
         return ExternalID(self.raw['external_ids'])
 
@@ -324,6 +374,8 @@ class Track(SimplifiedTrack):
 
 
 class CopyRight:
+    __slots__ = ('text', 'copyright_type')
+
     def __init__(self, raw_copyright):
         self.text = raw_copyright['text']
         self.copyright_type = raw_copyright['type']
@@ -334,6 +386,8 @@ class CopyRight:
 
 
 class ExternalID:
+    __slots__ = ('identifier_type', 'identifier')
+
     def __init__(self, raw_external_id):
         self.identifier_type = list(raw_external_id.keys())[0]
         self.identifier = list(raw_external_id.values())[0]
@@ -346,6 +400,8 @@ class ExternalID:
 
 
 class Image:
+    __slots__ = ('height', 'width', 'url')
+
     def __init__(self, image):
         self.height = image['height']
         self.width = image['width']
@@ -360,11 +416,15 @@ class Image:
 
 
 class Restrictions:
+    __slots__ = ('raw',)
+
     def __init__(self, raw_restrictions):
         self.raw = raw_restrictions['restrictions']['reason']
 
 
 class TrackLink:
+    __slots__ = ('external_url', 'href', 'link_id', 'obj_type', 'uri')
+
     def __init__(self, raw_track_link):
         self.external_url = raw_track_link['external_url']['spotify']
         self.href = raw_track_link['href']
@@ -374,48 +434,64 @@ class TrackLink:
 
 
 class SearchResult:
-    def __init__(self, q, search_type, result_json, auth):
+    def __init__(self, q, search_type, result_json, auth, paging_class=None, timeout=None):
         self.q = q
         self.search_type = search_type
         self.raw = result_json
         self.auth = auth
-        self.albums = CustomPaging(
+        paging_class = paging_class or CustomPaging
+        self.albums = paging_class(
             self.raw,
             SimplifiedAlbum,
             self.auth,
-            'albums') if 'album' in self.search_type else None
-        self.artists = CustomPaging(
+            'albums',
+            timeout=timeout) if 'album' in self.search_type else None
+        self.artists = paging_class(
             self.raw,
             Artist,
             self.auth,
-            'artists') if 'artist' in self.search_type else None
-        self.playlists = CustomPaging(
+            'artists',
+            timeout=timeout) if 'artist' in self.search_type else None
+        self.playlists = paging_class(
             self.raw,
             SimplifiedPlaylist,
             self.auth,
-            'playlists') if 'playlist' in self.search_type else None
-        self.tracks = CustomPaging(
+            'playlists',
+            timeout=timeout) if 'playlist' in self.search_type else None
+        self.tracks = paging_class(
             self.raw,
             Track,
             self.auth,
-            'tracks') if 'track' in self.search_type else None
+            'tracks',
+            timeout=timeout) if 'track' in self.search_type else None
 
     def __str__(self):
         return 'Query:{q} Result:{search_type}'.format(q=self.q, search_type=self.search_type)
 
 
 class PagingBase:
-    def __init__(self, klass, auth):
+    def __init__(self, klass, auth, timeout=None):
         self.klass = klass
         self.auth = auth
+        self.timeout = timeout
+        # Timeout.total bounds fetching every following page of this object
+        self.deadline = Timeout.resolve(timeout).deadline()
 
     def __paging__(self, url):
-        response = http_request(self.auth, url)
-        page = Paging(response, self.klass, self.auth)
-        self.href = response['href']
-        self.items = self.__items__(response)
-        self.next = response['next']
-        self.previous = response['previous']
+        response = http_request(self.auth, url, timeout=self.timeout, deadline=self.deadline)
+        return self.__update__(response)
+
+    def __page__(self, response):
+        page = type(self)(response, self.klass, self.auth, timeout=self.timeout)
+        page.deadline = self.deadline
+        return page
+
+    def __update__(self, response):
+        page = self.__page__(response)
+        self.href = page.href
+        self.items = page.items
+        self.next = page.next
+        self.previous = page.previous
         return page
 
     def __items__(self, response):
@@ -428,10 +504,132 @@ class PagingBase:
             return self.__paging__(self.next)
         return None
 
+    def __fetch__(self, url):
+        response = http_request(self.auth, url, timeout=self.timeout, deadline=self.deadline)
+        return self.__page__(response)
+
+    def __page_urls__(self):
+        """
+        URLs of all following pages, computed from offset, limit and total.
+        :return: generator of URLs, or None if they can not be computed
+        """
+        if not self.next:
+            return None
+        parsed = urllib.parse.urlsplit(self.next)
+        query = urllib.parse.parse_qsl(parsed.query)
+        return (
+            urllib.parse.urlunsplit(parsed._replace(query=urllib.parse.urlencode(
+                [(name, value) for name, value in query if name != 'offset'] + [('offset', offset)]
+            )))
+            for offset in range(self.offset + self.limit, self.total, self.limit)
+        )
+
+    def checkpoint(self):
+        """
+        Position after this page, which iter_pages and iter_items can resume from.
+        :return: dict which can be serialized to JSON
+        """
+        return {'next': self.next}
+
+    def iter_pages(self, parallelism=1, prefetch=0, checkpoint=None):
+        """
+        Iterate over this page and all following pages. Pages are fetched as the iteration goes,
+        each one as a new paging object, and this object is left unchanged.
+        :param parallelism: Optional. Maximum number of pages fetched at once. Offset-based pages are
+                            fetched ahead in order, cursor-based pages always one at a time. Default 1.
+        :param prefetch: Optional. Number of pages fetched in the background ahead of the page
+                         being consumed. Cursor-based pages are fetched as soon as the previous one lands.
+                         Default 0, the next page is fetched when it is asked for.
+        :param checkpoint: Optional. Return value of checkpoint() of a page of an earlier iteration over
+                           the same results. The iteration starts from the page after it.
+        :return: generator of paging objects
+        """
+        if checkpoint is not None:
+            if checkpoint['next']:
+                yield from self.__fetch__(checkpoint['next']).iter_pages(parallelism, prefetch)
+            return
+        ahead = max(prefetch, parallelism if parallelism > 1 else 0)
+        urls = self.__page_urls__() if ahead else None
+        yield self
+        if urls is not None:
+            yield from self.__fetch_ahead__(urls, ahead, parallelism)
+        elif prefetch:
+            yield from self.__read_ahead__(prefetch)
+        else:
+            page = self
+            while page.next:
+                page = self.__fetch__(page.next)
+                yield page
+
+    def __fetch_ahead__(self, urls, ahead, parallelism):
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            pending = deque(executor.submit(self.__fetch__, url) for url in itertools.islice(urls, ahead))
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    if not page.next:
+                        # the server may end the results before total, e.g. search past its maximum offset,
+                        # so the rest of the window is dropped along with its errors
+                        yield page
+                        return
+                    for url in itertools.islice(urls, 1):
+                        pending.append(executor.submit(self.__fetch__, url))
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def __read_ahead__(self, depth):
+        # a background thread follows the next links, at most depth pages ahead of the consumer
+        pages = queue.Queue()
+        slots = threading.Semaphore(depth)
+        stopped = threading.Event()
+
+        def fetch_pages():
+            page = self
+            try:
+                while page.next:
+                    slots.acquire()
+                    if stopped.is_set():
+                        return
+                    page = self.__fetch__(page.next)
+                    pages.put((page, None))
+            except Exception as e:
+                pages.put((None, e))
+                return
+            pages.put((None, None))
+
+        threading.Thread(target=fetch_pages, daemon=True).start()
+        try:
+            while True:
+                page, error = pages.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                slots.release()
+                yield page
+        finally:
+            stopped.set()
+            slots.release()
+
+    def iter_items(self, parallelism=1, prefetch=0, checkpoint=None):
+        """
+        Iterate over the items of this page and all following pages.
+        Only the pages being iterated or fetched are held in memory.
+        :param parallelism: Optional. See iter_pages. Default 1.
+        :param prefetch: Optional. See iter_pages. Default 0.
+        :param checkpoint: Optional. See iter_pages. Default None.
+        :return: generator of the objects of klass
+        """
+        for page in self.iter_pages(parallelism, prefetch, checkpoint):
+            for item in page.items or ():
+                yield item
+
 
 class Paging(PagingBase):
-    def __init__(self, raw_json, klass, auth):
-        super(Paging, self).__init__(klass, auth)
+    def __init__(self, raw_json, klass, auth, timeout=None):
+        super(Paging, self).__init__(klass, auth, timeout)
         self.href = raw_json['href']
         self.items = self.__items__(raw_json)
         self.limit = raw_json['limit']
@@ -445,10 +643,15 @@ class Paging(PagingBase):
             return self.__paging__(self.previous)
         return None
 
+    def checkpoint(self):
+        checkpoint = super(Paging, self).checkpoint()
+        checkpoint['offset'] = min(self.offset + self.limit, self.total)
+        return checkpoint
+
 
 class CustomPaging(PagingBase):
-    def __init__(self, raw_json, klass, auth, key):
-        super(CustomPaging, self).__init__(klass, auth)
+    def __init__(self, raw_json, klass, auth, key, timeout=None):
+        super(CustomPaging, self).__init__(klass, auth, timeout)
         self.message = raw_json.get('message', None)
         self.key = key
         self.raw = raw_json[key]
@@ -460,13 +663,9 @@ class CustomPaging(PagingBase):
         self.previous = self.raw['previous']
         self.total = self.raw['total']
 
-    def __paging__(self, url):
-        response = http_request(self.auth, url)
-        page = CustomPaging(response, self.klass, self.auth, self.key)
-        self.href = response[self.key]['href']
-        self.items = self.__items__(response[self.key])
-        self.next = response[self.key]['next']
-        self.previous = response[self.key]['previous']
+    def __page__(self, response):
+        page = type(self)(response, self.klass, self.auth, self.key, timeout=self.timeout)
+        page.deadline = self.deadline
         return page
 
     def get_previous(self):
@@ -474,10 +673,15 @@ class CustomPaging(PagingBase):
             return self.__paging__(self.previous)
         return None
 
+    def checkpoint(self):
+        checkpoint = super(CustomPaging, self).checkpoint()
+        checkpoint['offset'] = min(self.offset + self.limit, self.total)
+        return checkpoint
+
 
 class CursorBasedPaging(PagingBase):
-    def __init__(self, raw_json, klass, auth, key):
-        super(CursorBasedPaging, self).__init__(klass, auth)
+    def __init__(self, raw_json, klass, auth, key, timeout=None):
+        super(CursorBasedPaging, self).__init__(klass, auth, timeout)
         self.key = key
         self.raw = raw_json[key]
         self.href = self.raw['href']
@@ -487,17 +691,167 @@ class CursorBasedPaging(PagingBase):
         self.cursor = {'after': self.raw['cursors']['after']}
         self.total = self.raw['total']
 
-    def __paging__(self, url):
-        response = http_request(self.auth, url)
-        page = CustomPaging(response, self.klass, self.auth, self.key)
-        self.href = response[self.key]['href']
-        self.items = self.__items__(response[self.key])
-        self.next = response[self.key]['next']
-        self.previous = response[self.key]['previous']
+    def __page__(self, response):
+        page = type(self)(response, self.klass, self.auth, self.key, timeout=self.timeout)
+        page.deadline = self.deadline
         return page
 
+    def __page_urls__(self):
+        # the next cursor is only known once a page has arrived
+        return None
+
+    def checkpoint(self):
+        checkpoint = super(CursorBasedPaging, self).checkpoint()
+        checkpoint['after'] = self.cursor['after']
+        return checkpoint
+
+    def __update__(self, response):
+        page = self.__page__(response)
+        self.href = page.href
+        self.items = page.items
+        self.next = page.next
+        self.cursor = page.cursor
+        return page
+
+
+class AsyncPagingBase:
+    """
+    Mixin for paging objects of AsyncSpotify. get_next and get_previous are coroutines,
+    and `async for` iterates over the items of this page and all following pages.
+    """
+
+    async def __paging__(self, url):
+        response = await async_http_request(self.auth, url, timeout=self.timeout, deadline=self.deadline)
+        return self.__update__(response)
+
+    async def get_next(self):
+        if self.next:
+            return await self.__paging__(self.next)
+        return None
+
+    async def get_previous(self):
+        if getattr(self, 'previous', None):
+            return await self.__paging__(self.previous)
+        return None
+
+    async def __fetch__(self, url):
+        response = await async_http_request(self.auth, url, timeout=self.timeout, deadline=self.deadline)
+        return self.__page__(response)
+
+    async def iter_pages(self, parallelism=1, prefetch=0, checkpoint=None):
+        """
+        Coroutine version of PagingBase.iter_pages, used with `async for`.
+        """
+        if checkpoint is not None:
+            if checkpoint['next']:
+                start = await self.__fetch__(checkpoint['next'])
+                pages = start.iter_pages(parallelism, prefetch)
+                try:
+                    async for page in pages:
+                        yield page
+                finally:
+                    await pages.aclose()
+            return
+        ahead = max(prefetch, parallelism if parallelism > 1 else 0)
+        urls = self.__page_urls__() if ahead else None
+        yield self
+        if urls is not None:
+            pages = self.__fetch_ahead__(urls, ahead, parallelism)
+        elif prefetch:
+            pages = self.__read_ahead__(prefetch)
+        else:
+            pages = None
+        if pages is not None:
+            try:
+                async for page in pages:
+                    yield page
+            finally:
+                await pages.aclose()
+            return
+        page = self
+        while page.next:
+            page = await self.__fetch__(page.next)
+            yield page
+
+    async def __fetch_ahead__(self, urls, ahead, parallelism):
+        semaphore = asyncio.Semaphore(parallelism)
+
+        async def fetch(url):
+            async with semaphore:
+                return await self.__fetch__(url)
+
+        pending = deque(asyncio.ensure_future(fetch(url)) for url in itertools.islice(urls, ahead))
+        try:
+            while pending:
+                page = await pending.popleft()
+                if not page.next:
+                    yield page
+                    return
+                for url in itertools.islice(urls, 1):
+                    pending.append(asyncio.ensure_future(fetch(url)))
+                yield page
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    # retrieve the error of a dropped page, so that it is not logged as never retrieved
+                    task.exception()
+                task.cancel()
+
+    async def __read_ahead__(self, depth):
+        pages = asyncio.Queue()
+        slots = asyncio.Semaphore(depth)
+
+        async def fetch_pages():
+            page = self
+            try:
+                while page.next:
+                    await slots.acquire()
+                    page = await self.__fetch__(page.next)
+                    pages.put_nowait((page, None))
+            except Exception as e:
+                pages.put_nowait((None, e))
+                return
+            pages.put_nowait((None, None))
+
+        task = asyncio.ensure_future(fetch_pages())
+        try:
+            while True:
+                page, error = await pages.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                slots.release()
+                yield page
+        finally:
+            task.cancel()
+
+    async def iter_items(self, parallelism=1, prefetch=0, checkpoint=None):
+        """
+        Coroutine version of PagingBase.iter_items, used with `async for`.
+        """
+        async for page in self.iter_pages(parallelism, prefetch, checkpoint):
+            for item in page.items or ():
+                yield item
+
+    def __aiter__(self):
+        return self.iter_items()
+
+
+class AsyncPaging(AsyncPagingBase, Paging):
+    pass
+
+
+class AsyncCustomPaging(AsyncPagingBase, CustomPaging):
+    pass
+
+
+class AsyncCursorBasedPaging(AsyncPagingBase, CursorBasedPaging):
+    pass
+
 
 class UserBase(ObjectBase):
+    __slots__ = ()
 
     def __str__(self):
         return self.display_name
@@ -523,7 +877,7 @@ class UserBase(ObjectBase):
     def user_id(self):
         return self.raw['id']
 
-    @property
+    @memoized
     def images(self):
         images = []
         converter = Image.convert_to_image
@@ -541,6 +895,7 @@ class UserBase(ObjectBase):
 
 
 class PrivateUser(UserBase):
+    __slots__ = ()
 
     @property
     def birthdate(self):
@@ -564,10 +919,11 @@ class PrivateUser(UserBase):
 
 
 class PublicUser(UserBase):
-    pass
+    __slots__ = ()
 
 
 class SimplifiedPlaylist(SimplifiedObjectBase):
+    __slots__ = ()
 
     def __str__(self):
         return self.playlist_id
@@ -580,7 +936,7 @@ class SimplifiedPlaylist(SimplifiedObjectBase):
     def playlist_id(self):
         return self.raw['id']
 
-    @property
+    @memoized
     def images(self):
         images = []
         converter = Image.convert_to_image
@@ -588,7 +944,7 @@ class SimplifiedPlaylist(SimplifiedObjectBase):
             images.append(converter(image))
         return images
 
-    @property
+    @memoized
     def owner(self):
         return PublicUser(self.raw['owner'])
 
@@ -600,7 +956,7 @@ class SimplifiedPlaylist(SimplifiedObjectBase):
     def snapshot_id(self):
         return self.raw['snapshot_id']
 
-    @property
+    @memoized
     def tracks(self):
         return {
             'href': self.raw['tracks']['href'],
@@ -609,6 +965,7 @@ class SimplifiedPlaylist(SimplifiedObjectBase):
 
 
 class Playlist(SimplifiedPlaylist):
+    __slots__ = ()
 
     def __str__(self):
         return self.name
@@ -628,28 +985,40 @@ class Playlist(SimplifiedPlaylist):
 
 
 class AudioAnalysis(ObjectBase):
-    @property
+    __slots__ = ()
+
+    @memoized
     def bars(self):
         return [TimeInterval(bar) for bar in self.raw['bars']]
 
-    @property
+    @memoized
     def beats(self):
         return [TimeInterval(beat) for beat in self.raw['beats']]
 
-    @property
+    @memoized
     def sections(self):
         return [Section(section) for section in self.raw['sections']]
 
-    @property
+    @memoized
     def segments(self):
         return [Segment(segment) for segment in self.raw['segments']]
 
-    @property
+    @memoized
     def tatums(self):
         return [TimeInterval(tatum) for tatum in self.raw['tatums']]
 
+    @memoized
+    def columns(self):
+        """
+        :return: ColumnarAudioAnalysis object, NumPy arrays of bars, beats, sections, segments and tatums.
+                 Requires numpy.
+        """
+        return ColumnarAudioAnalysis(self.raw)
+
 
 class TimeInterval(ObjectBase):
+    __slots__ = ()
+
     @property
     def start(self):
         return self.raw['start']
@@ -664,6 +1033,8 @@ class TimeInterval(ObjectBase):
 
 
 class Section(ObjectBase):
+    __slots__ = ()
+
     @property
     def start(self):
         return self.raw['start']
@@ -718,6 +1089,8 @@ class Section(ObjectBase):
 
 
 class Segment(ObjectBase):
+    __slots__ = ()
+
     @property
     def start(self):
         return self.raw['start']
@@ -756,6 +1129,8 @@ class Segment(ObjectBase):
 
 
 class Category(ObjectBase):
+    __slots__ = ()
+
     def __str__(self):
         return self.name
 
@@ -763,7 +1138,7 @@ class Category(ObjectBase):
     def href(self):
         return self.raw['href']
 
-    @property
+    @memoized
     def icons(self):
         icons = []
         converter = Image.convert_to_image
@@ -781,16 +1156,20 @@ class Category(ObjectBase):
 
 
 class RecommendationsResponse(ObjectBase):
-    @property
+    __slots__ = ()
+
+    @memoized
     def seeds(self):
         return [seed for seed in self.raw['seeds']]
 
-    @property
+    @memoized
     def tracks(self):
         return [SimplifiedTrack.to_object(track) for track in self.raw['tracks']]
 
 
 class RecommendationSeed(ObjectBase):
+    __slots__ = ()
+
     @property
     def after_filtering_size(self):
         return self.raw['afterFilteringSize']
@@ -817,20 +1196,24 @@ class RecommendationSeed(ObjectBase):
 
 
 class SavedAlbum(ObjectBase):
+    __slots__ = ()
+
     @property
     def added_at(self):
         return self.raw['added_at']
 
-    @property
+    @memoized
     def album(self):
         return Album(self.raw['album'])
 
 
 class SavedTrack(ObjectBase):
+    __slots__ = ()
+
     @property
     def added_at(self):
         return self.raw['added_at']
 
-    @property
+    @memoized
     def track(self):
         return Track(self.raw['track'])
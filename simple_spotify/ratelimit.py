@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+from .errors import RequestTimeoutError
+
+
+class RateLimiter:
+    """
+    Client-side token bucket shared by every request of the process.
+    A 429 response pauses all senders until its Retry-After has passed.
+    :param rate: Optional. Requests per second. Default None, only Retry-After pauses are applied.
+    :param burst: Optional. Bucket size, number of requests which can be sent at once. Default rate.
+    :param max_retries: Optional. How many times one request is sent again after a 429. Default 5.
+    """
+
+    def __init__(self, rate=None, burst=None, max_retries=5):
+        self.rate = rate
+        self.burst = burst or rate or 1
+        self.max_retries = max_retries
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.throttle_time = 0.0
+        self.throttled_responses = 0
+
+    @property
+    def stats(self):
+        return {
+            'queue_depth': self.queue_depth,
+            'throttle_time': self.throttle_time,
+            'throttled_responses': self.throttled_responses,
+        }
+
+    def _reserve(self):
+        """
+        Take a token. :return: Seconds to wait before sending.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self.rate:
+                return self._paused_until - now
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            ready_at = self._updated + max(0, -self._tokens) / self.rate
+            return max(ready_at, self._paused_until) - now
+
+    @property
+    def paused_for(self):
+        """
+        :return: Seconds until the current Retry-After pause ends, 0 if senders are not paused
+        """
+        return max(self._paused_until - time.monotonic(), 0)
+
+    def acquire(self, deadline=None):
+        """
+        Wait until a request can be sent.
+        :param deadline: Optional. time.monotonic() value. RequestTimeoutError is raised without waiting
+                         if the request could not be sent before it.
+        """
+        delay = self._reserve()
+        if delay <= 0:
+            return
+        check_deadline(delay, deadline)
+        started = time.monotonic()
+        with self._lock:
+            self.queue_depth += 1
+        try:
+            while delay > 0:
+                time.sleep(delay)
+                # a 429 may have paused everyone while this sender was waiting
+                delay = self.paused_for
+                check_deadline(delay, deadline)
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+                self.throttle_time += time.monotonic() - started
+
+    async def async_acquire(self, deadline=None):
+        delay = self._reserve()
+        if delay <= 0:
+            return
+        check_deadline(delay, deadline)
+        started = time.monotonic()
+        with self._lock:
+            self.queue_depth += 1
+        try:
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self.paused_for
+                check_deadline(delay, deadline)
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+                self.throttle_time += time.monotonic() - started
+
+    def pause(self, seconds):
+        """
+        Hold back every sender for seconds, e.g. the Retry-After of a 429 response.
+        """
+        with self._lock:
+            self.throttled_responses += 1
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._paused_until:
+                self._paused_until = resume_at
+            if self.rate:
+                # restart the bucket empty when the pause ends instead of releasing a burst
+                self._updated = max(self._updated, resume_at)
+                self._tokens = min(self._tokens, 1)
+
+
+def check_deadline(delay, deadline):
+    if deadline is not None and delay > 0 and time.monotonic() + delay >= deadline:
+        raise RequestTimeoutError('Deadline exceeded while rate limited.')
+
+
+def parse_retry_after(value, default=1):
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+_default_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter():
+    return _default_rate_limiter
+
+
+def set_rate_limiter(rate_limiter):
+    """
+    Replace the process-wide RateLimiter. None disables client-side rate limiting and 429 retries.
+    :param rate_limiter: RateLimiter object or None
+    """
+    global _default_rate_limiter
+    _default_rate_limiter = rate_limiter
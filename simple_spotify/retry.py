@@ -0,0 +1,120 @@
+import random
+import re
+import threading
+import time
+import urllib.parse
+
+from collections import Counter
+
+
+# PUT and DELETE on these paths save or remove items of the user's library, which is idempotent
+IDEMPOTENT_WRITE_PATHS = re.compile(r'^/v1/me/(albums|tracks|following)$')
+
+
+class RetryPolicy:
+    """
+    Retry of transient failures with exponential backoff and full jitter.
+    :param max_attempts: Optional. Maximum number of attempts of one request, including the first. Default 3.
+    :param backoff_base: Optional. Upper bound of the first backoff in seconds. Default 0.5.
+    :param backoff_max: Optional. Upper bound of any backoff in seconds. Default 30.
+    :param total_timeout: Optional. No retry is started after this many seconds since the first attempt. Default 60.
+    :param statuses: Optional. Response status codes which are retried. Default 500, 502, 503, 504.
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_max=30, total_timeout=60,
+                 statuses=(500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.total_timeout = total_timeout
+        self.statuses = statuses
+        self._lock = threading.Lock()
+        self.attempts = Counter()
+        self.retries = 0
+        self.exhausted = 0
+        self.backoff_time = 0.0
+
+    @property
+    def stats(self):
+        """
+        attempts maps the number of attempts a request took to the number of such requests.
+        """
+        with self._lock:
+            return {
+                'attempts': dict(self.attempts),
+                'retries': self.retries,
+                'exhausted': self.exhausted,
+                'backoff_time': self.backoff_time,
+            }
+
+    def is_idempotent(self, method, url):
+        if method in ('GET', 'HEAD'):
+            return True
+        if method in ('PUT', 'DELETE'):
+            return bool(IDEMPOTENT_WRITE_PATHS.search(urllib.parse.urlsplit(url).path))
+        return False
+
+    def backoff(self, retry_number):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** retry_number))
+
+    def start(self, method, url):
+        return RetryState(self, self.is_idempotent(method, url))
+
+    def _record(self, attempts, exhausted, backoff_time):
+        with self._lock:
+            self.attempts[attempts] += 1
+            self.retries += attempts - 1
+            self.exhausted += exhausted
+            self.backoff_time += backoff_time
+
+
+class RetryState:
+    """
+    Attempts of one request under a RetryPolicy.
+    """
+
+    def __init__(self, policy, retryable):
+        self.policy = policy
+        self.retryable = retryable
+        self.attempts = 1
+        self.backoff_time = 0.0
+        self.started = time.monotonic()
+
+    def next_delay(self, status=None):
+        """
+        Call after a failed attempt, with the response status or None for a connection error.
+        :return: Seconds to wait before the next attempt, or None to give up.
+        """
+        policy = self.policy
+        if not self.retryable or (status is not None and status not in policy.statuses):
+            return None
+        delay = policy.backoff(self.attempts - 1)
+        elapsed = time.monotonic() - self.started
+        if self.attempts >= policy.max_attempts or (
+                policy.total_timeout is not None and elapsed + delay > policy.total_timeout):
+            policy._record(self.attempts, True, self.backoff_time)
+            self.retryable = False
+            return None
+        self.attempts += 1
+        self.backoff_time += delay
+        return delay
+
+    def done(self):
+        if self.retryable:
+            self.policy._record(self.attempts, False, self.backoff_time)
+
+
+_default_retry_policy = RetryPolicy()
+
+
+def get_retry_policy():
+    return _default_retry_policy
+
+
+def set_retry_policy(retry_policy):
+    """
+    Replace the process-wide RetryPolicy. None disables retries.
+    :param retry_policy: RetryPolicy object or None
+    """
+    global _default_retry_policy
+    _default_retry_policy = retry_policy
@@ -0,0 +1,141 @@
+from .columnar import AudioFeatureMatrix, numpy, parse_attributes, require_numpy
+from .consts import AUDIO_FEATURE_ATTRS, AUDIO_FEATURE_RANGES
+from .errors import ValidationError
+
+
+class AudioFeatureIndex:
+    """
+    Nearest-neighbour index of audio features, held in memory.
+    Tracks are compared by Euclidean distance between their attributes scaled to [0, 1] with AUDIO_FEATURE_RANGES.
+    Queries compare against every track, block_size rows at a time.
+    :param attrs: Optional. Compared attributes. Default AUDIO_FEATURE_ATTRS.
+    :param block_size: Optional. Number of rows compared at once. Default 65536.
+    """
+
+    def __init__(self, attrs=AUDIO_FEATURE_ATTRS, block_size=65536):
+        require_numpy()
+        self.attrs = tuple(attrs)
+        self.columns = {attr: i for i, attr in enumerate(self.attrs)}
+        self.block_size = block_size
+        self.track_ids = []
+        self.index = {}
+        ranges = numpy.array([AUDIO_FEATURE_RANGES[attr] for attr in self.attrs], dtype='float64')
+        self._lowest = ranges[:, 0]
+        self._scale = 1 / (ranges[:, 1] - ranges[:, 0])
+        self._values = numpy.empty((0, len(self.attrs)), dtype='float32')
+        self._scaled = numpy.empty((0, len(self.attrs)), dtype='float32')
+        self._norms = numpy.empty(0, dtype='float32')
+
+    def __len__(self):
+        return len(self.track_ids)
+
+    def __contains__(self, track_id):
+        return track_id in self.index
+
+    def scale(self, values):
+        """
+        :param values: Array of attribute values, the last axis in the order of attrs
+        :return: Values scaled to [0, 1]
+        """
+        return numpy.clip((numpy.asarray(values, dtype='float64') - self._lowest) * self._scale, 0, 1)
+
+    def _reserve(self, used, size):
+        capacity = len(self._values)
+        if size <= capacity:
+            return
+        # doubling keeps incremental inserts amortized O(1) per row
+        capacity = max(size, capacity * 2, 1024)
+        for name in ('_values', '_scaled', '_norms'):
+            array = getattr(self, name)
+            grown = numpy.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:used] = array[:used]
+            setattr(self, name, grown)
+
+    def add(self, features):
+        """
+        Insert tracks, or update tracks which are already in the index. Unknown tracks are skipped.
+        :param features: AudioFeatureMatrix object, or list of AudioFeature objects
+        """
+        if not isinstance(features, AudioFeatureMatrix):
+            features = AudioFeatureMatrix.from_features(features)
+        columns = [features.columns[attr] for attr in self.attrs]
+        rows = numpy.flatnonzero(features.known)
+        values = features.values[numpy.ix_(rows, columns)]
+        scaled = self.scale(values)
+
+        positions = numpy.empty(len(rows), dtype='int64')
+        used = size = len(self)
+        for i, row in enumerate(rows):
+            track_id = features.track_ids[row]
+            position = self.index.get(track_id)
+            if position is None:
+                position = self.index[track_id] = size
+                self.track_ids.append(track_id)
+                size += 1
+            positions[i] = position
+        self._reserve(used, size)
+        self._values[positions] = values
+        self._scaled[positions] = scaled
+        self._norms[positions] = (scaled * scaled).sum(axis=1)
+
+    def nearest(self, track_id=None, k=10, **attributes):
+        """
+        Find the tracks closest to track_id and/or to target attribute values.
+        :param track_id: Optional. Spotify ID of a track in the index. It is not part of the result.
+        :param k: Optional. Number of tracks. Default 10.
+        :param attributes: min_<attr> and max_<attr> bounds which the tracks must satisfy, and target_<attr>
+                           values which replace those of track_id. Without track_id, tracks are compared
+                           only on the target attributes.
+        :return: List of (track ID, distance), closest first
+        """
+        parsed = parse_attributes(attributes, self.columns)
+        targets = {attr: value for prefix, attr, value in parsed if prefix == 'target_'}
+        bounds = [(prefix, self.columns[attr], value) for prefix, attr, value in parsed if prefix != 'target_']
+        if track_id is not None:
+            dims = None
+            query = self._scaled[self.index[track_id]].astype('float64')
+            for attr, value in targets.items():
+                column = self.columns[attr]
+                query[column] = (value - self._lowest[column]) * self._scale[column]
+            query = numpy.clip(query, 0, 1)
+        elif targets:
+            dims = numpy.array([self.columns[attr] for attr in targets])
+            query = self.scale([
+                targets[attr] if attr in targets else AUDIO_FEATURE_RANGES[attr][0] for attr in self.attrs
+            ])[dims]
+        else:
+            raise ValidationError('track_id or a target_ attribute is required.')
+
+        exclude = self.index.get(track_id) if track_id is not None else None
+        query = query.astype('float32')
+        query_norm = float((query * query).sum())
+        found_distances = []
+        found_positions = []
+        for start in range(0, len(self), self.block_size):
+            end = min(start + self.block_size, len(self))
+            scaled = self._scaled[start:end]
+            if dims is None:
+                # |x - q|^2 = |x|^2 - 2 x.q + |q|^2, one matrix-vector product per block
+                distances = self._norms[start:end] - 2 * scaled.dot(query) + query_norm
+            else:
+                difference = scaled[:, dims] - query
+                distances = (difference * difference).sum(axis=1)
+            for prefix, column, value in bounds:
+                values = self._values[start:end, column]
+                distances[values < value if prefix == 'min_' else values > value] = numpy.inf
+            if exclude is not None and start <= exclude < end:
+                distances[exclude - start] = numpy.inf
+            if k < len(distances):
+                candidates = numpy.argpartition(distances, k)[:k]
+            else:
+                candidates = numpy.arange(len(distances))
+            candidates = candidates[numpy.isfinite(distances[candidates])]
+            found_distances.append(distances[candidates])
+            found_positions.append(candidates + start)
+
+        if not found_distances:
+            return []
+        distances = numpy.concatenate(found_distances)
+        positions = numpy.concatenate(found_positions)
+        order = numpy.argsort(distances, kind='stable')[:k]
+        return [(self.track_ids[positions[i]], float(numpy.sqrt(max(distances[i], 0)))) for i in order]
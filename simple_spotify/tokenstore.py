@@ -0,0 +1,124 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from .cache import _Transaction
+
+
+class SQLiteTokenStore:
+    """
+    Access tokens shared by the processes on one host through a SQLite database.
+    A process which finds an expired token takes a lease on it and refreshes it, so the others poll for
+    that one refresh and then read the new token. The database is not locked during the token request.
+    :param path: Path of the database file.
+    :param timeout: Optional. Seconds to wait for a lock held by another process. Default 30.
+    :param lease: Optional. Seconds after which the refresh of a process which crashed or hangs is taken over.
+                  Longer than a token request can take. Default 90.
+    :param poll_interval: Optional. Seconds between two reads while another process refreshes. Default 0.05.
+    """
+
+    def __init__(self, path, timeout=30, lease=90, poll_interval=0.05):
+        self.path = path
+        self.timeout = timeout
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, token TEXT NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, '
+                         'expires REAL NOT NULL)')
+
+    @property
+    def connection(self):
+        # sqlite3 connections can be used neither from other threads nor after fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self.connection)
+
+    def get(self, key):
+        """
+        :return: Token dict or None
+        """
+        row = self.connection.execute('SELECT token FROM tokens WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def refresh(self, key, is_fresh, fetch):
+        """
+        Get the stored token, or replace it with a new one if it is missing or not fresh.
+        :param key: Key of the token
+        :param is_fresh: Callable which takes a token dict and returns whether it can still be used
+        :param fetch: Callable which requests a new token and returns it as a dict
+        :return: Token dict
+        """
+        token = self.get(key)
+        if token is not None and is_fresh(token):
+            return token
+        owner = uuid.uuid4().hex
+        while True:
+            token, leased = self._take_lease(key, owner, is_fresh)
+            if token is not None:
+                return token
+            if leased:
+                break
+            # another process is refreshing the token
+            time.sleep(self.poll_interval)
+        try:
+            token = fetch()
+        except BaseException:
+            self._release_lease(key, owner)
+            raise
+        with self._transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO tokens (key, token) VALUES (?, ?)', (key, json.dumps(token)))
+            conn.execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, owner))
+        return token
+
+    def _take_lease(self, key, owner, is_fresh):
+        """
+        :return: (fresh token or None, whether the lease was taken)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # the refresh may have finished since the token was read
+            row = conn.execute('SELECT token FROM tokens WHERE key = ?', (key,)).fetchone()
+            token = json.loads(row[0]) if row is not None else None
+            if token is not None and is_fresh(token):
+                return token, False
+            row = conn.execute('SELECT expires FROM leases WHERE key = ?', (key,)).fetchone()
+            if row is not None and row[0] > now:
+                return None, False
+            conn.execute(
+                'INSERT OR REPLACE INTO leases (key, owner, expires) VALUES (?, ?, ?)', (key, owner, now + self.lease)
+            )
+        return None, True
+
+    def _release_lease(self, key, owner):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, owner))
+
+
+_default_token_store = None
+
+
+def get_token_store():
+    return _default_token_store
+
+
+def set_token_store(store):
+    """
+    Share access tokens through store. ClientCredentialsFlow.token_request reuses a stored token of the
+    same client, and token refreshes of ClientCredentialsFlow and AuthorizationCodeFlow are stored.
+    None disables sharing.
+    :param store: SQLiteTokenStore object, or any object with a refresh method of the same signature
+    """
+    global _default_token_store
+    _default_token_store = store
@@ -1,42 +1,250 @@
+import asyncio
+import http.client
 import json
+import socket
+import time
 import urllib.error
-import urllib.request
 
-from .errors import HTTPError, ValidationError
+from types import MappingProxyType
 
+from .cache import get_cache
+from .errors import HTTPError, RateLimitError, RequestTimeoutError, ValidationError
+from .identity import get_identity_map
+from .pool import Timeout, get_async_pool, get_pool
+from .ratelimit import get_rate_limiter, parse_retry_after
+from .retry import get_retry_policy
 
-def http_request(authorization, url, data=None, method='GET'):
-    headers = authorization.authorization
+
+JSON_HEADERS = MappingProxyType({'Content-Type': 'application/json'})
+
+NO_HEADERS = MappingProxyType({})
+
+
+def request_headers(method):
     if method in ['POST', 'PUT', 'DELETE']:
-        headers['Content-Type'] = 'application/json'
-    req = urllib.request.Request(
-        url, data, headers=headers, method=method
+        return JSON_HEADERS
+    return NO_HEADERS
+
+
+def check_response(res):
+    if res.status == 429:
+        raise RateLimitError(res.reason, res.status, parse_retry_after(res.headers.get('Retry-After')))
+    if res.status >= 400:
+        raise HTTPError(res.reason, res.status)
+    return res
+
+
+def should_retry_rate_limited(rate_limiter, res, retries):
+    if res.status != 429 or rate_limiter is None or retries >= rate_limiter.max_retries:
+        return False
+    rate_limiter.pause(parse_retry_after(res.headers.get('Retry-After')))
+    return True
+
+
+def decode_response(res, method):
+    if method == 'GET':
+        return json.loads(res.body.decode('utf-8'))
+    return res.body.decode('utf-8')
+
+
+def share_entities(response):
+    identity_map = get_identity_map()
+    if identity_map is None or not isinstance(response, (dict, list)):
+        return response
+    return identity_map.share(response)
+
+
+def transport_error(error, url):
+    if isinstance(error, (socket.timeout, asyncio.TimeoutError)):
+        return RequestTimeoutError('Timed out: {url}'.format(url=url))
+    return urllib.error.URLError(error)
+
+
+def backoff_delay(delay, deadline):
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        raise RequestTimeoutError('Deadline exceeded.')
+    return delay
+
+
+def token_expired(auth):
+    # authorization objects without expired() only need an authorization mapping and are never refreshed
+    expired = getattr(auth, 'expired', None)
+    return expired is not None and expired()
+
+
+def pick_credential(authorization):
+    """
+    :return: (auth object whose access token is sent, RateLimiter of the attempt or None)
+    """
+    if hasattr(authorization, 'select'):
+        return authorization.select()
+    return authorization, None
+
+
+def credential_headers(credential, headers, rate_limiter):
+    if headers:
+        headers = dict(headers, **credential.authorization)
+    else:
+        headers = credential.authorization
+    return headers, rate_limiter or get_rate_limiter()
+
+
+def select_credential(authorization, headers):
+    """
+    Pick the credential of an attempt and refresh its access token if it expires soon, so that every
+    request, including the ones of paging objects, is sent with a fresh token.
+    :return: (headers of an attempt, RateLimiter of the attempt or None)
+    """
+    if authorization is None:
+        return headers, get_rate_limiter()
+    credential, rate_limiter = pick_credential(authorization)
+    if token_expired(credential):
+        credential.refresh_if_expired()
+    return credential_headers(credential, headers, rate_limiter)
+
+
+async def async_select_credential(authorization, headers):
+    """
+    Coroutine version of select_credential.
+    """
+    if authorization is None:
+        return headers, get_rate_limiter()
+    credential, rate_limiter = pick_credential(authorization)
+    if token_expired(credential):
+        # token refresh is a blocking request, keep it off the event loop
+        await asyncio.get_event_loop().run_in_executor(None, credential.refresh_if_expired)
+    return credential_headers(credential, headers, rate_limiter)
+
+
+def urlopen(url, data=None, headers=None, method='GET', timeout=None, deadline=None, authorization=None):
+    """
+    :param authorization: Optional. Auth object whose access token is sent. A CredentialPool
+                          picks a credential for every attempt.
+    """
+    timeout = Timeout.resolve(timeout)
+    if deadline is None:
+        deadline = timeout.deadline()
+    retry_policy = get_retry_policy()
+    retry = retry_policy.start(method, url) if retry_policy is not None else None
+    throttled = 0
+    while True:
+        attempt_headers, rate_limiter = select_credential(authorization, headers)
+        if rate_limiter is not None:
+            rate_limiter.acquire(deadline)
+        try:
+            res = get_pool().urlopen(
+                method, url, body=data, headers=attempt_headers, timeout=timeout.clamp(deadline)
+            )
+        except (OSError, http.client.HTTPException) as e:
+            delay = retry.next_delay() if retry is not None else None
+            if delay is None:
+                raise transport_error(e, url) from e
+            time.sleep(backoff_delay(delay, deadline))
+            continue
+        if should_retry_rate_limited(rate_limiter, res, throttled):
+            throttled += 1
+            continue
+        delay = retry.next_delay(res.status) if retry is not None and res.status >= 400 else None
+        if delay is None:
+            if retry is not None:
+                retry.done()
+            return check_response(res)
+        time.sleep(backoff_delay(delay, deadline))
+
+
+async def async_urlopen(url, data=None, headers=None, method='GET', timeout=None, deadline=None,
+                        authorization=None):
+    timeout = Timeout.resolve(timeout)
+    if deadline is None:
+        deadline = timeout.deadline()
+    retry_policy = get_retry_policy()
+    retry = retry_policy.start(method, url) if retry_policy is not None else None
+    throttled = 0
+    while True:
+        attempt_headers, rate_limiter = await async_select_credential(authorization, headers)
+        if rate_limiter is not None:
+            await rate_limiter.async_acquire(deadline)
+        try:
+            res = await get_async_pool().urlopen(
+                method, url, body=data, headers=attempt_headers, timeout=timeout.clamp(deadline)
+            )
+        except (OSError, http.client.HTTPException, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+            delay = retry.next_delay() if retry is not None else None
+            if delay is None:
+                raise transport_error(e, url) from e
+            await asyncio.sleep(backoff_delay(delay, deadline))
+            continue
+        if should_retry_rate_limited(rate_limiter, res, throttled):
+            throttled += 1
+            continue
+        delay = retry.next_delay(res.status) if retry is not None and res.status >= 400 else None
+        if delay is None:
+            if retry is not None:
+                retry.done()
+            return check_response(res)
+        await asyncio.sleep(backoff_delay(delay, deadline))
+
+
+def http_request(authorization, url, data=None, method='GET', timeout=None, deadline=None):
+    cache = get_cache()
+    entry = None
+    if cache is not None and method == 'GET':
+        entry = cache.lookup(authorization, url)
+        if entry is not None and entry.is_fresh():
+            return share_entities(entry.value)
+    headers = request_headers(method)
+    if entry is not None and entry.validators:
+        headers = dict(headers, **entry.validators)
+    res = urlopen(
+        url, data, headers=headers, method=method, timeout=timeout, deadline=deadline, authorization=authorization
     )
-    try:
-        with urllib.request.urlopen(req) as res:
-            if method == 'GET':
-                response = json.loads(res.read().decode('utf-8'))
-            else:
-                response = res.read().decode('utf-8')
-    except urllib.error.HTTPError as e:
-        raise HTTPError(e.reason, e.code)
-    return response
+    return share_entities(update_cache(cache, authorization, url, method, res, entry))
 
 
-def post_request(authorization, url, data=None):
-    headers = authorization.authorization
-    headers['Content-Type'] = 'application/json'
-    req = urllib.request.Request(
-        url, data, headers=authorization.authorization, method='POST'
+async def async_http_request(authorization, url, data=None, method='GET', timeout=None, deadline=None):
+    cache = get_cache()
+    entry = None
+    # cache backends such as SQLiteCache read and write the disk and wait for locks, keep them off the event loop
+    loop = asyncio.get_event_loop()
+    if cache is not None and method == 'GET':
+        entry = await loop.run_in_executor(None, cache.lookup, authorization, url)
+        if entry is not None and entry.is_fresh():
+            return share_entities(entry.value)
+    headers = request_headers(method)
+    if entry is not None and entry.validators:
+        headers = dict(headers, **entry.validators)
+    res = await async_urlopen(
+        url, data, headers=headers, method=method, timeout=timeout, deadline=deadline, authorization=authorization
     )
-    try:
-        with urllib.request.urlopen(req) as res:
-            response = json.loads(res.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        raise HTTPError(e.reason, e.code)
+    if cache is None:
+        return share_entities(decode_response(res, method))
+    response = await loop.run_in_executor(None, update_cache, cache, authorization, url, method, res, entry)
+    return share_entities(response)
+
+
+def update_cache(cache, authorization, url, method, res, entry=None):
+    if cache is not None:
+        if method != 'GET':
+            cache.invalidate(authorization, url)
+        elif res.status == 304 and entry is not None:
+            return cache.revalidated(authorization, url, entry, res.headers)
+        else:
+            cache.set(authorization, url, res.body, res.headers)
+    return decode_response(res, method)
+
+
+def post_request(authorization, url, data=None, timeout=None):
+    headers = request_headers('POST')
+    res = urlopen(url, data, headers=headers, method='POST', timeout=timeout, authorization=authorization)
+    response = json.loads(res.body.decode('utf-8'))
     return response
 
 
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
 def validate_limit(limit, maximum=50):
     # validate limit
     if not isinstance(limit, int):